@@ -626,6 +626,9 @@ def _run_subagent_in_dedicated_thread(
         if agent.subagent_registry:
             agent.subagent_registry.fail(run_id, str(e))
     finally:
+        # Pooled HTTP connections and MCP sessions are bound to this loop; close them with it
+        from grizzyclaw.utils.async_runner import close_loop_connections
+        close_loop_connections(loop)
         loop.close()
 
 
@@ -3840,7 +3843,10 @@ When the user provides a detailed plan, phased implementation, or step-by-step g
         if not mcp_file.exists():
             return
         try:
-            from grizzyclaw.mcp_client import health_check_servers, invalidate_tools_cache
+            from grizzyclaw.mcp_client import health_check_servers, invalidate_tools_cache, tools_discovered
+            # Discovery is lazy (first message that needs tools); don't spawn servers before that
+            if not tools_discovered(mcp_file):
+                return
             status = await health_check_servers(mcp_file)
             down = [n for n, ok in status.items() if not ok]
             if down:
@@ -6,7 +6,6 @@ from typing import Callable, Dict, Optional
 from dataclasses import dataclass
 from aiohttp import web
 import hmac
-import hashlib
 
 logger = logging.getLogger(__name__)
 
@@ -230,21 +229,12 @@ class WebhookServer:
         if not signature:
             return False
 
+        # One-shot OpenSSL HMAC (no Python-level HMAC object)
+        expected = hmac.digest(secret.encode(), body.encode(), "sha256").hex()
         # Handle different signature formats
         if signature.startswith("sha256="):
             # GitHub-style signature
-            expected = "sha256=" + hmac.new(
-                secret.encode(),
-                body.encode(),
-                hashlib.sha256
-            ).hexdigest()
-        else:
-            # Simple HMAC signature
-            expected = hmac.new(
-                secret.encode(),
-                body.encode(),
-                hashlib.sha256
-            ).hexdigest()
+            expected = "sha256=" + expected
 
         return hmac.compare_digest(signature, expected)
 
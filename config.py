@@ -87,6 +87,10 @@ class Settings(BaseSettings):
     # Model routing: use a smaller/faster model for simple tasks (e.g. list files, short Q&A)
     simple_task_provider: Optional[str] = Field(default=None, alias="SIMPLE_TASK_PROVIDER")
     simple_task_model: Optional[str] = Field(default=None, alias="SIMPLE_TASK_MODEL")
+    # Cache responses to identical deterministic prompts (temperature 0, no tools)
+    llm_response_cache_enabled: bool = Field(default=False, alias="LLM_RESPONSE_CACHE_ENABLED")
+    llm_response_cache_ttl: int = Field(default=3600, alias="LLM_RESPONSE_CACHE_TTL")  # Seconds
+    llm_response_cache_max_entries: int = Field(default=500, alias="LLM_RESPONSE_CACHE_MAX_ENTRIES")
 
     # Channels
     telegram_bot_token: Optional[str] = Field(default=None, alias="TELEGRAM_BOT_TOKEN")
@@ -191,6 +191,20 @@ class DaemonService:
             except asyncio.CancelledError:
                 pass
 
+        # Release pooled LLM provider connections
+        try:
+            from grizzyclaw.llm._pool import close_connector
+            await close_connector()
+        except Exception as e:
+            logger.debug(f"LLM connector close skipped: {e}")
+
+        # Stop pooled MCP sessions and HTTP clients
+        try:
+            from grizzyclaw.mcp_client import aclose_mcp_connections
+            await aclose_mcp_connections()
+        except Exception as e:
+            logger.debug(f"MCP connection close skipped: {e}")
+
         logger.info("GrizzyClaw daemon service stopped")
 
     async def reload_config(self):
@@ -261,6 +261,8 @@ class HealthCheckWorker(QThread):
                 ok = health.get(provider, False)
                 self.result_ready.emit(ok, provider)
             finally:
+                from grizzyclaw.utils.async_runner import close_loop_connections
+                close_loop_connections(loop)
                 loop.close()
         except Exception:
             provider = getattr(self.router, "default_provider", None) or "unknown"
@@ -373,6 +375,9 @@ class MessageWorker(QThread):
                 response_text, was_stopped = loop.run_until_complete(self._process_message())
                 self.message_ready.emit(response_text, was_stopped)
             finally:
+                # Pooled HTTP connections and MCP sessions are bound to this loop; close them with it
+                from grizzyclaw.utils.async_runner import close_loop_connections
+                close_loop_connections(loop)
                 loop.close()
         except Exception as e:
             self.error_occurred.emit(f"Error: {str(e)}")
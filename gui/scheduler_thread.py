@@ -12,6 +12,8 @@ import logging
 import threading
 from typing import Callable, Optional
 
+from grizzyclaw.utils.async_runner import close_loop_connections
+
 logger = logging.getLogger(__name__)
 
 _scheduler_thread: Optional[threading.Thread] = None
@@ -42,6 +44,8 @@ def start_scheduler_thread(get_agent: Callable[[], Optional[object]]) -> None:
             except Exception as e:
                 logger.exception("Scheduler thread exited: %s", e)
             finally:
+                # Pooled HTTP connections and MCP sessions are bound to this loop
+                close_loop_connections(loop)
                 loop.close()
 
         _scheduler_thread = threading.Thread(
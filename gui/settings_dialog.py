@@ -18,6 +18,7 @@ from PyQt6.QtGui import QFont
 
 from grizzyclaw.config import Settings, get_config_path
 from grizzyclaw.mcp_client import invalidate_tools_cache, discover_one_server, validate_server_config
+from grizzyclaw.utils.async_runner import close_loop_connections
 
 
 def _sanitize_telegram_token(raw: str) -> str | None:
@@ -69,8 +70,11 @@ class ModelFetchWorker(QThread):
         try:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
-            models = loop.run_until_complete(self.provider.list_models())
-            loop.close()
+            try:
+                models = loop.run_until_complete(self.provider.list_models())
+            finally:
+                close_loop_connections(loop)
+                loop.close()
             self.finished.emit(models)
         except Exception as e:
             self.error.emit(str(e))
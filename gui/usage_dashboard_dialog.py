@@ -164,10 +164,14 @@ class UsageDashboardDialog(QDialog):
                 try:
                     async def consume():
                         nonlocal approx
-                        async for chunk in agent.process_message(
-                            "benchmark_user", "Reply with exactly: OK"
-                        ):
-                            approx += len(chunk.split())
+                        from grizzyclaw.utils.async_runner import aclose_loop_connections
+                        try:
+                            async for chunk in agent.process_message(
+                                "benchmark_user", "Reply with exactly: OK"
+                            ):
+                                approx += len(chunk.split())
+                        finally:
+                            await aclose_loop_connections()
                     asyncio.run(consume())
                 except Exception as e:
                     err = str(e)
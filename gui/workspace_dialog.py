@@ -15,6 +15,7 @@ from typing import Any, Dict, Optional
 from grizzyclaw.workspaces import WorkspaceManager, Workspace, WorkspaceConfig, WORKSPACE_TEMPLATES
 from grizzyclaw.llm.lmstudio import _normalize_lmstudio_url
 from grizzyclaw.llm.lmstudio_v1 import LMStudioV1Provider
+from grizzyclaw.utils.async_runner import close_loop_connections
 
 
 class SaveWorkspaceWorker(QThread):
@@ -915,6 +916,7 @@ class WorkspaceDialog(QDialog):
                                 results.append((p[:40] + "…", f"Error: {e}"))
                                 break
                     finally:
+                        close_loop_connections(loop)
                         loop.close()
                 except Exception as e:
                     err_msg = str(e)
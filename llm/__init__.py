@@ -1,12 +1,59 @@
+import functools
+import time
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+# Seconds a health_check() result is reused, so bursts (router fallback, UI, supervisor)
+# collapse to a single probe per provider.
+HEALTH_CHECK_TTL = 5.0
+
+
+def cached_health_check(func):
+    """Decorate a provider's health_check() to reuse its result for HEALTH_CHECK_TTL seconds."""
+
+    @functools.wraps(func)
+    async def wrapper(self) -> bool:
+        cached = self._health_cache
+        if cached is not None and time.monotonic() - cached[0] < HEALTH_CHECK_TTL:
+            return cached[1]
+        result = await func(self)
+        self._health_cache = (time.monotonic(), result)
+        return result
+
+    return wrapper
+
+
+async def iter_line_batches(stream: Any) -> AsyncIterator[List[bytes]]:
+    """Yield the complete lines received in each read of an aiohttp response stream.
+
+    Streaming providers join the deltas parsed from one read and yield them once,
+    instead of paying an event-loop turn per token.
+    """
+    pending = b""
+    async for data in stream.iter_any():
+        pending += data
+        if b"\n" not in data:
+            continue
+        *lines, pending = pending.split(b"\n")
+        yield lines
+    if pending:
+        yield [pending]
 
 
 class LLMProvider(ABC):
+    # Cap on concurrent health_check/list_models probes the router sends this provider
+    # (None = only the router-wide limit applies).
+    max_concurrent_probes: Optional[int] = None
+
     def __init__(self, name: str, base_url: str, api_key: Optional[str] = None):
         self.name = name
         self.base_url = base_url
         self.api_key = api_key
+        self._health_cache: Optional[Tuple[float, bool]] = None
+
+    def invalidate_health_check(self) -> None:
+        """Drop the cached health_check() result (e.g. after a failed generate)."""
+        self._health_cache = None
 
     @abstractmethod
     async def generate(
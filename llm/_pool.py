@@ -0,0 +1,57 @@
+"""Shared aiohttp connection pool for the HTTP-based LLM providers."""
+import asyncio
+import weakref
+
+import aiohttp
+
+# One connector per event loop: the GUI runs coroutines on short-lived loops in
+# worker threads, and an aiohttp connector may only be used on the loop it was made on.
+_CONNECTORS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.TCPConnector]" = (
+    weakref.WeakKeyDictionary()
+)
+
+POOL_LIMIT = 256
+POOL_LIMIT_PER_HOST = 32
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75
+
+# Failures an HTTP probe (health check, model listing) is expected to hit. Anything
+# else -- notably asyncio.CancelledError -- propagates to the caller.
+TRANSPORT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError, OSError)
+
+
+def get_connector() -> aiohttp.TCPConnector:
+    """Return the shared connector for the running loop, creating it on first use.
+
+    Sessions must be opened with ``connector_owner=False`` so closing a session
+    leaves the pooled connections open for the next request.
+    """
+    loop = asyncio.get_running_loop()
+    connector = _CONNECTORS.get(loop)
+    if connector is None or connector.closed:
+        connector = aiohttp.TCPConnector(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        _CONNECTORS[loop] = connector
+    return connector
+
+
+async def close_connector() -> None:
+    """Close the running loop's shared connector (call on shutdown)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    connector = _CONNECTORS.pop(loop, None)
+    if connector is not None and not connector.closed:
+        await connector.close()
+
+
+def pooled_session(**kwargs) -> aiohttp.ClientSession:
+    """Open a ClientSession backed by the shared connector."""
+    return aiohttp.ClientSession(
+        connector=get_connector(), connector_owner=False, **kwargs
+    )
@@ -3,6 +3,7 @@ from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from . import (
     LLMProvider,
+    cached_health_check,
     LLMError,
     LLMProviderNotAvailable,
     LLMAuthenticationError,
@@ -143,6 +144,7 @@ class AnthropicProvider(LLMProvider):
                 raise LLMProviderNotAvailable(f"Cannot connect to Anthropic: {e}") from e
             raise LLMError(str(e)) from e
 
+    @cached_health_check
     async def health_check(self) -> bool:
         try:
             client = self._get_client()
@@ -3,7 +3,14 @@ import logging
 import aiohttp
 from typing import Any, AsyncIterator, Dict, List, Optional
 
-from . import LLMProvider, LLMError, LLMProviderNotAvailable
+from . import (
+    LLMProvider,
+    LLMError,
+    LLMProviderNotAvailable,
+    cached_health_check,
+    iter_line_batches,
+)
+from ._pool import TRANSPORT_ERRORS, pooled_session
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +55,7 @@ class LMStudioProvider(LLMProvider):
         timeout = aiohttp.ClientTimeout(total=300, connect=30)
 
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with pooled_session(timeout=timeout) as session:
                 async with session.post(url, json=payload, headers=headers) as response:
                     if response.status != 200:
                         body = await response.text()
@@ -58,19 +65,29 @@ class LMStudioProvider(LLMProvider):
                         )
 
                     import json
-                    async for line in response.content:
-                        line = line.decode().strip()
-                        if line.startswith("data: "):
+                    done = False
+                    async for lines in iter_line_batches(response.content):
+                        batch: List[str] = []
+                        for line in lines:
+                            line = line.decode().strip()
+                            if not line.startswith("data: "):
+                                continue
                             data_str = line[6:]
                             if data_str == "[DONE]":
+                                done = True
                                 break
                             try:
                                 data = json.loads(data_str)
                                 delta = data.get("choices", [{}])[0].get("delta", {})
-                                if "content" in delta:
-                                    yield delta["content"]
-                            except (json.JSONDecodeError, KeyError, IndexError):
+                                content = delta.get("content")
+                                if isinstance(content, str) and content:
+                                    batch.append(content)
+                            except (json.JSONDecodeError, KeyError, IndexError, AttributeError):
                                 continue  # skip malformed SSE lines
+                        if batch:
+                            yield "".join(batch)
+                        if done:
+                            break
         except aiohttp.ClientError as e:
             raise LLMProviderNotAvailable(f"Cannot connect to LM Studio: {e}")
         except LLMError:
@@ -78,25 +95,26 @@ class LMStudioProvider(LLMProvider):
         except LLMProviderNotAvailable:
             raise
 
+    @cached_health_check
     async def health_check(self) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(f"{self.base_url}/models") as response:
                     return response.status == 200
-        except Exception as e:
+        except TRANSPORT_ERRORS as e:
             logger.debug("LM Studio health check failed: %s", e)
             return False
 
     async def list_models(self) -> List[Dict[str, Any]]:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(f"{self.base_url}/models") as response:
                     data = await response.json()
                     return [
                         {"id": m["id"], "name": m.get("id", m["id"])}
                         for m in data.get("data", [])
                     ]
-        except Exception as e:
+        except TRANSPORT_ERRORS + (ValueError, KeyError) as e:
             logger.debug("LM Studio list_models failed: %s", e)
             return []
 
@@ -115,7 +133,7 @@ class LMStudioProvider(LLMProvider):
             headers = {}
             if self.api_key:
                 headers["Authorization"] = f"Bearer {self.api_key}"
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(url, headers=headers or None) as response:
                     if response.status != 200:
                         return None
@@ -156,7 +174,7 @@ class LMStudioProvider(LLMProvider):
             payload["tool_choice"] = "auto"
         timeout = aiohttp.ClientTimeout(total=300, connect=30)
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with pooled_session(timeout=timeout) as session:
                 async with session.post(url, json=payload, headers=headers) as response:
                     if response.status != 200:
                         body = await response.text()
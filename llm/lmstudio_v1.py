@@ -11,7 +11,14 @@ from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
 
-from . import LLMProvider, LLMError, LLMProviderNotAvailable
+from . import (
+    LLMProvider,
+    LLMError,
+    LLMProviderNotAvailable,
+    cached_health_check,
+    iter_line_batches,
+)
+from ._pool import pooled_session
 
 logger = logging.getLogger(__name__)
 
@@ -124,7 +131,7 @@ class LMStudioV1Provider(LLMProvider):
 
         timeout = aiohttp.ClientTimeout(total=300, connect=30)
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with pooled_session(timeout=timeout) as session:
                 async with session.post(
                     self._chat_url(),
                     json=payload,
@@ -136,11 +143,13 @@ class LMStudioV1Provider(LLMProvider):
                             f"LM Studio v1 error: {response.status}"
                             + (f" — {body[:200]}" if body else "")
                         )
-                    async for line in response.content:
-                        line_str = line.decode("utf-8", errors="replace").strip()
-                        if not line_str.startswith("event:") and not line_str.startswith("data:"):
-                            continue
-                        if line_str.startswith("data:"):
+                    async for lines in iter_line_batches(response.content):
+                        batch: List[str] = []
+                        stream_error: Optional[str] = None
+                        for line in lines:
+                            line_str = line.decode("utf-8", errors="replace").strip()
+                            if not line_str.startswith("data:"):
+                                continue
                             data_str = line_str[5:].strip()
                             if not data_str:
                                 continue
@@ -154,11 +163,15 @@ class LMStudioV1Provider(LLMProvider):
                             if event_type == "message.delta":
                                 content = data.get("content")
                                 if isinstance(content, str) and content:
-                                    yield content
+                                    batch.append(content)
                             elif event_type == "error":
                                 err = data.get("error") or {}
-                                msg = err.get("message", "Unknown error")
-                                raise LLMError(f"LM Studio v1 stream error: {msg}")
+                                stream_error = err.get("message", "Unknown error")
+                                break
+                        if batch:
+                            yield "".join(batch)
+                        if stream_error is not None:
+                            raise LLMError(f"LM Studio v1 stream error: {stream_error}")
         except LLMError:
             raise
         except LLMProviderNotAvailable:
@@ -168,9 +181,10 @@ class LMStudioV1Provider(LLMProvider):
         except Exception as e:
             raise LLMError(str(e)) from e
 
+    @cached_health_check
     async def health_check(self) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(self._models_url(), headers=self._headers()) as response:
                     return response.status == 200
         except Exception as e:
@@ -179,7 +193,7 @@ class LMStudioV1Provider(LLMProvider):
 
     async def list_models(self) -> List[Dict[str, Any]]:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(self._models_url(), headers=self._headers()) as response:
                     if response.status != 200:
                         return []
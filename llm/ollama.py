@@ -3,7 +3,14 @@ import logging
 import aiohttp
 from typing import Any, AsyncIterator, Dict, List, Optional
 
-from . import LLMProvider, LLMError, LLMProviderNotAvailable
+from . import (
+    LLMProvider,
+    LLMError,
+    LLMProviderNotAvailable,
+    cached_health_check,
+    iter_line_batches,
+)
+from ._pool import TRANSPORT_ERRORS, pooled_session
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +55,9 @@ def _convert_messages_for_ollama(messages: List[Dict[str, Any]]) -> List[Dict[st
 
 
 class OllamaProvider(LLMProvider):
+    # Ollama serializes concurrent model probes server-side
+    max_concurrent_probes = 2
+
     def __init__(self, base_url: str = "http://localhost:11434"):
         super().__init__("ollama", base_url)
 
@@ -78,7 +88,7 @@ class OllamaProvider(LLMProvider):
         try:
             # Allow long responses; Ollama can be slow with larger models
             timeout = aiohttp.ClientTimeout(total=300, connect=30)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with pooled_session(timeout=timeout) as session:
                 async with session.post(url, json=payload) as response:
                     if response.status != 200:
                         body = ""
@@ -93,10 +103,13 @@ class OllamaProvider(LLMProvider):
                             )
                         raise LLMError(f"Ollama error: {response.status}" + (f" - {body[:200]}" if body else ""))
 
-                    async for line in response.content:
-                        if line:
-                            import json
+                    import json
 
+                    async for lines in iter_line_batches(response.content):
+                        batch: List[str] = []
+                        for line in lines:
+                            if not line.strip():
+                                continue
                             try:
                                 data = json.loads(line)
                             except json.JSONDecodeError:
@@ -106,7 +119,7 @@ class OllamaProvider(LLMProvider):
                                 continue
                             # Yield content so the agent sees intro text (e.g. "Checking your calendar...")
                             if "content" in msg and msg["content"]:
-                                yield msg["content"]
+                                batch.append(msg["content"])
                             # When Ollama parses model output as tool calls (e.g. SKILL_ACTION), content can be empty.
                             # Serialize tool_calls to text so the agent can parse SKILL_ACTION / TOOL_CALL and execute.
                             for tc in msg.get("tool_calls") or []:
@@ -121,36 +134,39 @@ class OllamaProvider(LLMProvider):
                                     args_str = str(args).strip()
                                 else:
                                     args_str = "{}"
-                                yield f"\n{name} = {args_str}"
+                                batch.append(f"\n{name} = {args_str}")
+                        if batch:
+                            yield "".join(batch)
         except aiohttp.ClientError as e:
             raise LLMProviderNotAvailable(f"Cannot connect to Ollama: {e}")
 
+    @cached_health_check
     async def health_check(self) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(f"{self.base_url}/api/tags") as response:
                     return response.status == 200
-        except Exception as e:
+        except TRANSPORT_ERRORS as e:
             logger.debug("Ollama health check failed: %s", e)
             return False
 
     async def list_models(self) -> List[Dict[str, Any]]:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(f"{self.base_url}/api/tags") as response:
                     data = await response.json()
                     return [
                         {"id": m["name"], "name": m["name"]}
                         for m in data.get("models", [])
                     ]
-        except Exception as e:
+        except TRANSPORT_ERRORS + (ValueError, KeyError) as e:
             logger.debug("Ollama list_models failed: %s", e)
             return []
 
     async def get_model_context_length(self, model: str) -> Optional[int]:
         """Query model's max context length via /api/show. Returns None on failure."""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(
                     f"{self.base_url}/api/show", json={"model": model, "verbose": False}
                 ) as response:
@@ -178,9 +194,9 @@ class OllamaProvider(LLMProvider):
         payload = {"name": model, "stream": False}
 
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.post(url, json=payload) as response:
                     return response.status == 200
-        except Exception as e:
+        except TRANSPORT_ERRORS as e:
             logger.debug("Ollama pull_model failed: %s", e)
             return False
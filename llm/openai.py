@@ -1,15 +1,24 @@
+import json
 import logging
 
 import aiohttp
-from typing import Any, AsyncIterator, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 from . import (
     LLMProvider,
+    cached_health_check,
+    iter_line_batches,
     LLMError,
     LLMProviderNotAvailable,
     LLMAuthenticationError,
     LLMRateLimitError,
 )
+from ._pool import pooled_session
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +42,42 @@ def _extract_delta_content(data: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
 class OpenAIProvider(LLMProvider):
     def __init__(self, api_key: str, base_url: str = "https://api.openai.com/v1"):
         super().__init__("openai", base_url, api_key)
+        # Serialized '{"model":...,"temperature":...,"stream":true,' prefixes keyed by
+        # (model, temperature, max_tokens); only the messages change between agent turns.
+        self._payload_prefix_cache: Dict[Tuple[str, float, Optional[int]], bytes] = {}
+
+    def _encode_payload(
+        self,
+        messages: List[Dict[str, Any]],
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> bytes:
+        """Build the streaming request body, reusing the pre-serialized static fields."""
+        key = (model, temperature, max_tokens or None)
+        prefix = self._payload_prefix_cache.get(key)
+        if prefix is None:
+            static: Dict[str, Any] = {
+                "model": model,
+                "temperature": temperature,
+                "stream": True,
+            }
+            if max_tokens:
+                static["max_tokens"] = max_tokens
+            # Drop the closing brace so the messages array can be appended
+            prefix = _dumps(static)[:-1] + b',"messages":'
+            self._payload_prefix_cache[key] = prefix
+        return prefix + _dumps(messages) + b"}"
 
     async def generate(
         self,
@@ -53,20 +95,12 @@ class OpenAIProvider(LLMProvider):
             "Authorization": f"Bearer {self.api_key}",
         }
 
-        payload = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-            "stream": True,
-        }
-
-        if max_tokens:
-            payload["max_tokens"] = max_tokens
+        body = self._encode_payload(messages, model, temperature, max_tokens)
 
         try:
             timeout = aiohttp.ClientTimeout(total=120)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(url, json=payload, headers=headers) as response:
+            async with pooled_session(timeout=timeout) as session:
+                async with session.post(url, data=body, headers=headers) as response:
                     if response.status == 401:
                         raise LLMAuthenticationError("Invalid OpenAI API key")
                     elif response.status == 429:
@@ -74,24 +108,32 @@ class OpenAIProvider(LLMProvider):
                     elif response.status != 200:
                         raise LLMError(f"OpenAI error: {response.status}")
 
-                    async for line in response.content:
-                        line = line.decode().strip()
-                        if line.startswith("data: "):
+                    done = False
+                    async for lines in iter_line_batches(response.content):
+                        batch: List[str] = []
+                        for line in lines:
+                            line = line.decode().strip()
+                            if not line.startswith("data: "):
+                                continue
                             data_str = line[6:]
                             if data_str == "[DONE]":
+                                done = True
                                 break
-                            import json
-
                             data = json.loads(data_str)
                             content = _extract_delta_content(data)
-                            if content is not None:
-                                yield content
+                            if content:
+                                batch.append(content)
+                        if batch:
+                            yield "".join(batch)
+                        if done:
+                            break
         except aiohttp.ClientError as e:
             raise LLMProviderNotAvailable(f"Cannot connect to OpenAI: {e}")
 
+    @cached_health_check
     async def health_check(self) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(
                     f"{self.base_url}/models",
                     headers={"Authorization": f"Bearer {self.api_key}"},
@@ -103,7 +145,7 @@ class OpenAIProvider(LLMProvider):
 
     async def list_models(self) -> List[Dict[str, Any]]:
         try:
-            async with aiohttp.ClientSession() as session:
+            async with pooled_session() as session:
                 async with session.get(
                     f"{self.base_url}/models",
                     headers={"Authorization": f"Bearer {self.api_key}"},
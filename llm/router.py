@@ -1,6 +1,14 @@
 import asyncio
+import contextlib
+import hashlib
+import json
 import logging
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+import random
+import time
+import weakref
+from collections import OrderedDict
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 from . import (
     LLMProvider,
@@ -16,20 +24,57 @@ from .openai import OpenAIProvider
 from .anthropic import AnthropicProvider
 from .openrouter import OpenRouterProvider
 
+try:
+    from grizzyclaw.observability.metrics import get_metrics
+except ImportError:
+    get_metrics = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_INITIAL_BACKOFF = 1.0
 DEFAULT_MAX_BACKOFF = 60.0
+DEFAULT_PROBE_CONCURRENCY = 4
+DEFAULT_RESPONSE_CACHE_TTL = 3600.0
+DEFAULT_RESPONSE_CACHE_MAX_ENTRIES = 500
+# Substrings (lowercase) marking a model-not-found error; fallback is skipped for these
+MODEL_NOT_FOUND_MARKERS = ("404", "not found")
+# Seconds a passed probe lets a provider be used as a fallback without re-probing
+FALLBACK_HEALTHY_TTL = 30.0
 
 
 class LLMRouter:
-    def __init__(self):
+    def __init__(
+        self,
+        probe_concurrency: int = DEFAULT_PROBE_CONCURRENCY,
+        response_cache_ttl: float = 0.0,
+        response_cache_max_entries: int = DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+    ):
         self.providers: Dict[str, LLMProvider] = {}
         self.default_provider: Optional[str] = None
         self.provider_models: Dict[str, str] = {}  # Maps provider name to default model
+        # Registration order, prebuilt for fallback and probe iteration
+        self._provider_order: Tuple[str, ...] = ()
+        # Max concurrent health_check/list_models probes across all providers
+        self.probe_concurrency = max(1, probe_concurrency)
+        # Semaphores are per event loop (GUI handlers run on short-lived loops)
+        self._probe_sems: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.BoundedSemaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Opt-in response cache for deterministic (temperature 0, no tools) prompts.
+        # response_cache_ttl <= 0 disables it.
+        self.response_cache_ttl = response_cache_ttl
+        self.response_cache_max_entries = max(1, response_cache_max_entries)
+        self._response_cache: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        # In-flight locks so identical concurrent requests hit the provider once:
+        # key -> [lock, requests holding or waiting on it]; dropped when the count hits 0
+        self._response_locks: Dict[Tuple[int, str], List[Any]] = {}
+        # Provider name -> monotonic time of its last passed probe (only healthy results kept)
+        self._healthy_at: Dict[str, float] = {}
 
     def add_provider(self, name: str, provider: LLMProvider, default: bool = False):
+        if name not in self.providers:
+            self._provider_order += (name,)
         self.providers[name] = provider
         # Only set default when explicitly requested; otherwise the first-added
         # provider would always win (e.g. ollama over lmstudio when ollama is added first).
@@ -121,6 +166,59 @@ class LLMRouter:
         if self.default_provider is None and self.providers:
             self.default_provider = next(iter(self.providers))
 
+        if getattr(settings, "llm_response_cache_enabled", False):
+            self.response_cache_ttl = float(
+                getattr(settings, "llm_response_cache_ttl", DEFAULT_RESPONSE_CACHE_TTL)
+            )
+            self.response_cache_max_entries = max(
+                1,
+                int(getattr(settings, "llm_response_cache_max_entries", DEFAULT_RESPONSE_CACHE_MAX_ENTRIES)),
+            )
+
+    def _response_cache_key(
+        self,
+        messages: List[Dict[str, Any]],
+        provider: Optional[str],
+        model: Optional[str],
+        kwargs: Dict[str, Any],
+    ) -> Optional[str]:
+        """Return a cache key for a deterministic request, or None if it must not be cached."""
+        if self.response_cache_ttl <= 0:
+            return None
+        if kwargs.get("temperature") != 0 or kwargs.get("tools"):
+            return None
+        provider_name = provider or self.default_provider
+        if not model and provider_name in self.provider_models:
+            model = self.provider_models[provider_name]
+        params = {k: v for k, v in kwargs.items() if k not in ("max_retries", "on_fallback")}
+        try:
+            raw = json.dumps(
+                [provider_name, model, messages, params], sort_keys=True, default=str
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _response_cache_get(self, key: str) -> Optional[List[str]]:
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, chunks = entry
+        if time.monotonic() >= expires_at:
+            del self._response_cache[key]
+            return None
+        self._response_cache.move_to_end(key)
+        return chunks
+
+    def _response_cache_put(self, key: str, chunks: List[str]) -> None:
+        self._response_cache[key] = (time.monotonic() + self.response_cache_ttl, chunks)
+        self._response_cache.move_to_end(key)
+        while len(self._response_cache) > self.response_cache_max_entries:
+            self._response_cache.popitem(last=False)
+
+    def clear_response_cache(self) -> None:
+        self._response_cache.clear()
+
     async def generate(
         self,
         messages: List[Dict[str, Any]],
@@ -128,6 +226,58 @@ class LLMRouter:
         model: Optional[str] = None,
         on_fallback: Optional[Callable[[str], None]] = None,
         **kwargs,
+    ) -> AsyncIterator[str]:
+        cache_key = self._response_cache_key(messages, provider, model, kwargs)
+        if cache_key is None:
+            async for chunk in self._generate(
+                messages, provider=provider, model=model, on_fallback=on_fallback, **kwargs
+            ):
+                yield chunk
+            return
+
+        lock_key = (id(asyncio.get_running_loop()), cache_key)
+        entry = self._response_locks.get(lock_key)
+        if entry is None:
+            entry = self._response_locks[lock_key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        lock = entry[0]
+        try:
+            async with lock:
+                cached = self._response_cache_get(cache_key)
+                if cached is None:
+                    fell_back = False
+
+                    def _on_fallback(name: str) -> None:
+                        nonlocal fell_back
+                        fell_back = True
+                        if on_fallback:
+                            on_fallback(name)
+
+                    chunks: List[str] = []
+                    async for chunk in self._generate(
+                        messages, provider=provider, model=model, on_fallback=_on_fallback, **kwargs
+                    ):
+                        chunks.append(chunk)
+                        yield chunk
+                    # A fallback provider's answer must not be served for the requested one
+                    if not fell_back:
+                        self._response_cache_put(cache_key, chunks)
+                    return
+        finally:
+            # Not lock.locked(): that is False between a release and the next waiter waking
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._response_locks.pop(lock_key, None)
+        for chunk in cached:
+            yield chunk
+
+    async def _generate(
+        self,
+        messages: List[Dict[str, Any]],
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        on_fallback: Optional[Callable[[str], None]] = None,
+        **kwargs,
     ) -> AsyncIterator[str]:
         provider_name = provider or self.default_provider
         # Pop so we don't pass to provider.generate
@@ -139,8 +289,7 @@ class LLMRouter:
         llm_provider = self.providers[provider_name]
 
         # Use provider's configured model if no model specified
-        if not model and provider_name in self.provider_models:
-            model = self.provider_models[provider_name]
+        model = model or self.provider_models.get(provider_name)
 
         last_error: Optional[Exception] = None
         backoff = DEFAULT_INITIAL_BACKOFF
@@ -148,29 +297,35 @@ class LLMRouter:
 
         for attempt in range(max_retries + 1):
             try:
-                import time
-                t0 = time.perf_counter()
+                t0 = perf_counter()
                 token_count = 0
                 async for chunk in llm_provider.generate(messages, model=model, **kwargs):
-                    token_count += len(chunk.split())  # Approximate
+                    # Approximate word count without allocating a list per chunk
+                    token_count += (chunk.count(" ") + 1) if chunk else 0
                     yield chunk
-                elapsed = time.perf_counter() - t0
-                try:
-                    from grizzyclaw.observability.metrics import get_metrics
-                    get_metrics().record_llm_call(elapsed, tokens_in=0, tokens_out=token_count, error=False)
-                except Exception:
-                    pass
+                elapsed = perf_counter() - t0
+                if get_metrics is not None:
+                    # Metrics must never break generation
+                    try:
+                        get_metrics().record_llm_call(elapsed, tokens_in=0, tokens_out=token_count, error=False)
+                    except Exception:
+                        pass
                 return
             except (LLMProviderNotAvailable, LLMError) as e:
                 last_error = e
-                try:
-                    from grizzyclaw.observability.metrics import get_metrics
-                    get_metrics().record_llm_call(0, error=True)
-                except Exception:
-                    pass
+                # Don't serve a stale "healthy" for a provider that just failed
+                llm_provider.invalidate_health_check()
+                self._healthy_at.pop(provider_name, None)
+                if get_metrics is not None:
+                    try:
+                        get_metrics().record_llm_call(0, error=True)
+                    except Exception:
+                        pass
                 if isinstance(e, LLMAuthenticationError) or attempt >= max_retries:
                     break
-                wait = min(backoff, DEFAULT_MAX_BACKOFF)
+                # Full jitter: sleep a random slice of the capped backoff so concurrent
+                # sessions don't retry a recovering provider in lockstep.
+                wait = random.uniform(0, min(backoff, DEFAULT_MAX_BACKOFF))
                 logger.warning(
                     f"LLM call failed: {e}, retrying in {wait:.1f}s (attempt {attempt + 1}/{max_retries})"
                 )
@@ -178,9 +333,11 @@ class LLMRouter:
                 backoff = min(backoff * 2, DEFAULT_MAX_BACKOFF)
             except (asyncio.TimeoutError, ConnectionError, OSError) as e:
                 last_error = e
+                llm_provider.invalidate_health_check()
+                self._healthy_at.pop(provider_name, None)
                 if attempt >= max_retries:
                     break
-                wait = min(backoff, DEFAULT_MAX_BACKOFF)
+                wait = random.uniform(0, min(backoff, DEFAULT_MAX_BACKOFF))
                 logger.warning(
                     f"Transient error: {e}, retrying in {wait:.1f}s (attempt {attempt + 1}/{max_retries})"
                 )
@@ -189,25 +346,28 @@ class LLMRouter:
 
         # Try fallback providers before giving up (skip for model-not-found - user should fix config)
         first_error = str(last_error or "Unknown error").strip()
-        is_model_not_found = "404" in first_error or "not found" in first_error.lower()
+        first_error_l = first_error.lower()
+        is_model_not_found = any(m in first_error_l for m in MODEL_NOT_FOUND_MARKERS)
         if not is_model_not_found:
             logger.warning(f"Provider {provider_name} failed after {max_retries + 1} attempts: {first_error}, trying fallback")
-        for name, fallback in self.providers.items():
-            if name != provider_name and not is_model_not_found:
+            async for name in self._healthy_fallbacks(provider_name):
+                fallback = self.providers[name]
                 try:
-                    if await fallback.health_check():
-                        logger.info(f"Falling back to {name}")
-                        if on_fallback:
-                            try:
-                                on_fallback(name)
-                            except Exception:
-                                pass
-                        async for chunk in fallback.generate(
-                            messages, model=model, **kwargs
-                        ):
-                            yield chunk
-                        return
-                except Exception:
+                    logger.info(f"Falling back to {name}")
+                    if on_fallback:
+                        try:
+                            on_fallback(name)
+                        except Exception:
+                            pass
+                    async for chunk in fallback.generate(
+                        messages, model=model, **kwargs
+                    ):
+                        yield chunk
+                    return
+                except Exception as e:
+                    self._healthy_at.pop(name, None)
+                    if isinstance(e, LLMError):
+                        fallback.invalidate_health_check()
                     continue
         raise LLMError(
             "No LLM providers available. "
@@ -215,17 +375,72 @@ class LLMRouter:
             + "If you changed the Ollama/LM Studio URL or model in Settings, click Save and restart the app (or toggle Telegram off/on) for changes to take effect."
         )
 
-    async def health_check(self) -> Dict[str, bool]:
-        results = {}
-        for name, provider in self.providers.items():
-            try:
+    def _probe_semaphore(self, key: str, limit: int) -> asyncio.BoundedSemaphore:
+        sems = self._probe_sems.setdefault(asyncio.get_running_loop(), {})
+        sem = sems.get(key)
+        if sem is None:
+            sem = sems[key] = asyncio.BoundedSemaphore(limit)
+        return sem
+
+    @contextlib.asynccontextmanager
+    async def _probe_slot(self, name: str, provider: LLMProvider):
+        """Bound concurrent probes router-wide and per provider (max_concurrent_probes)."""
+        async with self._probe_semaphore("", self.probe_concurrency):
+            limit = provider.max_concurrent_probes
+            if limit:
+                async with self._probe_semaphore(name, limit):
+                    yield
+            else:
+                yield
+
+    async def _probe_health(self, name: str, provider: LLMProvider) -> bool:
+        try:
+            async with self._probe_slot(name, provider):
                 # Short timeout so slow/unreachable providers (e.g. Anthropic) don't block
-                results[name] = await asyncio.wait_for(
-                    provider.health_check(), timeout=5.0
-                )
-            except (asyncio.TimeoutError, Exception):
-                results[name] = False
-        return results
+                ok = bool(await asyncio.wait_for(provider.health_check(), timeout=5.0))
+        except asyncio.TimeoutError:
+            ok = False
+        except Exception as e:
+            logger.debug("Health check for %s failed: %s", name, e)
+            ok = False
+        if ok:
+            self._healthy_at[name] = time.monotonic()
+        else:
+            self._healthy_at.pop(name, None)
+        return ok
+
+    async def _healthy_fallbacks(self, exclude: str) -> AsyncIterator[str]:
+        """Healthy providers other than exclude, in registration order.
+
+        Yields providers that passed a probe within FALLBACK_HEALTHY_TTL first; only if
+        the caller moves past all of them are the remaining candidates probed, all
+        concurrently, and the healthy ones yielded.
+        """
+        names = [n for n in self._provider_order if n != exclude]
+        now = time.monotonic()
+        fresh = [
+            n for n in names
+            if now - self._healthy_at.get(n, float("-inf")) < FALLBACK_HEALTHY_TTL
+        ]
+        for name in fresh:
+            yield name
+        rest = [n for n in names if n not in fresh]
+        if not rest:
+            return
+        results = await asyncio.gather(
+            *(self._probe_health(n, self.providers[n]) for n in rest)
+        )
+        for name, ok in zip(rest, results):
+            if ok:
+                yield name
+
+    async def health_check(self) -> Dict[str, bool]:
+        # Probe concurrently: total latency is the slowest provider, not the sum
+        names = self._provider_order
+        results = await asyncio.gather(
+            *(self._probe_health(name, self.providers[name]) for name in names)
+        )
+        return dict(zip(names, results))
 
     async def get_model_max_context_length(
         self, provider: str, model: str
@@ -247,15 +462,26 @@ class LLMRouter:
         if provider and provider in self.providers:
             return await self.providers[provider].list_models()
 
+        async def _list(name: str) -> List[Dict[str, Any]]:
+            prov = self.providers[name]
+            async with self._probe_slot(name, prov):
+                return await prov.list_models()
+
+        names = list(self.providers)
+        results = await asyncio.gather(
+            *(_list(name) for name in names),
+            return_exceptions=True,
+        )
         all_models = []
-        for name, prov in self.providers.items():
-            try:
-                models = await prov.list_models()
-                for m in models:
-                    m["provider"] = name
-                all_models.extend(models)
-            except Exception as e:
-                logger.debug("Failed to list models for %s: %s", name, e)
+        for name, models in zip(names, results):
+            if isinstance(models, BaseException):
+                if isinstance(models, asyncio.CancelledError):
+                    raise models
+                logger.debug("Failed to list models for %s: %s", name, models)
+                continue
+            for m in models:
+                m["provider"] = name
+            all_models.extend(models)
         return all_models
 
     async def test_connections(self):
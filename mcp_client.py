@@ -5,9 +5,15 @@ Supports local (stdio) and remote (HTTP) servers.
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import hashlib
 import json
 import logging
+import math
 import os
+import random
+import time
+import weakref
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -22,6 +28,22 @@ try:
 except ImportError:
     pass
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# orjson parses 2-5x faster; both raise ValueError subclasses on bad input
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps_bytes(obj: Any, sort_keys: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON with orjson when available (non-JSON values become str)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys, default=str).encode("utf-8")
+
+
 STREAMABLE_HTTP_AVAILABLE = False
 try:
     from mcp.client.streamable_http import streamable_http_client
@@ -30,22 +52,117 @@ try:
 except ImportError:
     pass
 
-# Cache for discovered tools: (mcp_file_path, mtime) -> {server_name: [(tool_name, description), ...]}
-_tools_cache: Dict[Tuple[str, float], Dict[str, List[Tuple[str, str]]]] = {}
-# Schema-aware cache (full tool objects): (mcp_file_path, mtime) -> {server_name: [{name, description, input_schema}]}
-_tools_cache_full: Dict[Tuple[str, float], Dict[str, List[Dict[str, Any]]]] = {}
+# Cache for discovered tools: (mcp_file_path, mtime) -> (expires_at, {server_name: [(tool_name, description), ...]})
+_tools_cache: Dict[Tuple[str, float], Tuple[float, Dict[str, List[Tuple[str, str]]]]] = {}
+# Schema-aware cache (full tool objects): (mcp_file_path, mtime) -> (expires_at, {server_name: [{name, description, input_schema}]})
+_tools_cache_full: Dict[Tuple[str, float], Tuple[float, Dict[str, List[Dict[str, Any]]]]] = {}
+
+# In-flight discovery passes: (loop id, kind, mcp_file_path, mtime) -> Task
+_discovery_inflight: Dict[Tuple[Any, ...], "asyncio.Task"] = {}
+
+# (resolved mcp_file path, tool name) -> owning server, from find_tool (most recent last)
+_tool_owners: Dict[Tuple[str, str], str] = {}
+TOOL_OWNERS_MAX_ENTRIES = 256
+
+# Absolute mcp_file path -> resolved path string (resolve() costs syscalls per call)
+_resolved_paths: Dict[str, str] = {}
+# Resolved path -> (checked_at, mtime); reused for MTIME_RECHECK_SECONDS before re-stat
+_mtime_cache: Dict[str, Tuple[float, float]] = {}
+MTIME_RECHECK_SECONDS = 1.0
+
+# Healthy discovery results persisted across restarts, reused while the MCP file's mtime
+# and the hash of its enabled server configs are unchanged
+TOOLS_DISK_CACHE_PATH = Path.home() / ".grizzyclaw" / "mcp_tools_cache.json"
+# (kind, path, mtime) already served from disk this process; later misses (TTL expiry)
+# re-probe so runtime tool changes are still picked up
+_disk_cache_served: set = set()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+
+# Seconds to reuse a discovery result in which some server failed or returned no tools,
+# so a server that was down at startup is retried soon instead of staying "no tools".
+DISCOVERY_NEGATIVE_TTL = 30
+# Seconds a healthy discovery result is reused even if the file is unchanged, so servers
+# that add tools at runtime are picked up (MCP_TOOLS_CACHE_TTL; 0 = only refetch on edit).
+TOOLS_CACHE_TTL = _env_float("MCP_TOOLS_CACHE_TTL", 300.0)
+# Past this many entries, expired ones are swept and new entries get half the TTL
+TOOLS_CACHE_PRESSURE_ENTRIES = 1000
 
 # Default timeout for a single tool call (seconds)
 DEFAULT_TOOL_CALL_TIMEOUT = 60
 
+# Jittered delay window (seconds) before retrying a tool call after a transient error,
+# so agents that hit the same server hiccup don't all retry at once
+TOOL_CALL_RETRY_DELAY = (0.5, 2.5)
+
 # Per-server discovery timeout (seconds)
 DISCOVERY_SERVER_TIMEOUT = 10
 
+# Connection limits for pooled httpx clients used with remote (HTTP) servers
+HTTP_POOL_MAX_CONNECTIONS = 100
+HTTP_POOL_MAX_KEEPALIVE = 20
+HTTP_POOL_KEEPALIVE_EXPIRY = 30.0
+
+# Pooled httpx clients: event loop -> {(headers, timeout): AsyncClient}. Servers that
+# share headers and timeout share one client (httpx keeps connections per origin).
+# Per loop because an httpx client cannot be shared across event loops.
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[frozenset, float], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_pooled_client(headers: Dict[str, Any], timeout: float = 30.0) -> Any:
+    """Return a long-lived httpx.AsyncClient for these headers/timeout so repeated calls
+    reuse TCP/TLS connections. Do not close it; use aclose_http_clients() on shutdown."""
+    import httpx
+
+    clients = _http_clients.setdefault(asyncio.get_running_loop(), {})
+    key = (frozenset((str(k), str(v)) for k, v in headers.items()), float(timeout))
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=headers,
+            timeout=httpx.Timeout(float(timeout)),
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY,
+            ),
+        )
+        clients[key] = client
+    return client
 
-def _get_expanded_env() -> Dict[str, str]:
-    """Expand PATH for macOS GUI apps that don't inherit shell env."""
-    env = os.environ.copy()
-    current = env.get("PATH", "")
+
+async def aclose_http_clients() -> None:
+    """Close the pooled HTTP clients of the running event loop (call on shutdown)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    clients = _http_clients.pop(loop, None) or {}
+    for client in clients.values():
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug("Failed to close MCP HTTP client: %s", e)
+
+
+# Expanded PATH memoized against the PATH it was built from: (base PATH, expanded PATH)
+_expanded_path_cache: Optional[Tuple[str, str]] = None
+
+
+def _expanded_path(current: str) -> str:
+    global _expanded_path_cache
+    cached = _expanded_path_cache
+    if cached is not None and cached[0] == current:
+        return cached[1]
+    base = current
     extra = [
         "/opt/homebrew/bin",
         "/opt/homebrew/sbin",
@@ -59,7 +176,15 @@ def _get_expanded_env() -> Dict[str, str]:
     for p in extra:
         if os.path.isdir(p) and p not in current:
             current = f"{p}:{current}"
-    env["PATH"] = current
+    _expanded_path_cache = (base, current)
+    return current
+
+
+def _get_expanded_env() -> Dict[str, str]:
+    """Expand PATH for macOS GUI apps that don't inherit shell env.
+    The isdir probes run once per distinct PATH, not on every server spawn."""
+    env = os.environ.copy()
+    env["PATH"] = _expanded_path(env.get("PATH", ""))
     return env
 
 
@@ -73,17 +198,26 @@ def _env_for_server(config: Dict[str, Any]) -> Dict[str, str]:
     return env
 
 
+def _is_json_array_str(s: str) -> bool:
+    return s.startswith("[") and s.endswith("]")
+
+
 def normalize_mcp_args(args: Any) -> List[str]:
     """Normalize MCP server args to a flat list of strings. Handles args stored as a
     JSON array string (e.g. '[\"mcp-macos\"]') so npx receives mcp-macos, not the literal string.
     """
     if args is None:
         return []
+    if isinstance(args, list) and all(
+        isinstance(a, str) and a == a.strip() and not _is_json_array_str(a) for a in args
+    ):
+        # Common case: already a clean list of plain strings
+        return list(args)
     if isinstance(args, str):
         s = args.strip()
-        if s.startswith("[") and s.endswith("]"):
+        if _is_json_array_str(s):
             try:
-                parsed = json.loads(s)
+                parsed = _json_loads(s)
                 if isinstance(parsed, list):
                     return [str(x) for x in parsed]
                 return [s]
@@ -95,9 +229,9 @@ def normalize_mcp_args(args: Any) -> List[str]:
     out: List[str] = []
     for a in args:
         s = str(a).strip()
-        if s.startswith("[") and s.endswith("]"):
+        if _is_json_array_str(s):
             try:
-                parsed = json.loads(s)
+                parsed = _json_loads(s)
                 if isinstance(parsed, list):
                     out.extend(str(x) for x in parsed)
                 else:
@@ -109,14 +243,56 @@ def normalize_mcp_args(args: Any) -> List[str]:
     return out
 
 
+# Parsed MCP config files: path -> ((mtime_ns, size), data); oldest dropped past the cap
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+CONFIG_CACHE_MAX_ENTRIES = 8
+# Pool keys of server configs edited or removed since they were read; session pools
+# close their sessions for these on next use instead of keeping them until shutdown
+_retired_config_keys: set = set()
+
+
+def _read_servers(mcp_file: Path) -> Optional[Dict[str, Any]]:
+    """Return the parsed mcpServers mapping, re-reading the file only when its mtime/size
+    changes. Returns None if the file is missing. The result is shared; do not mutate it."""
+    try:
+        st = mcp_file.stat()
+    except OSError:
+        return None
+    path_str = str(mcp_file)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _config_cache.get(path_str)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(mcp_file, "rb") as f:
+        data = _json_loads(f.read())
+    servers = data.get("mcpServers", {}) if isinstance(data, dict) else {}
+    if not isinstance(servers, dict):
+        servers = {}
+    if cached is not None:
+        _retire_changed_configs(cached[1], servers)
+    _config_cache.pop(path_str, None)
+    _config_cache[path_str] = (stamp, servers)
+    while len(_config_cache) > CONFIG_CACHE_MAX_ENTRIES:
+        del _config_cache[next(iter(_config_cache))]
+    return servers
+
+
+def _retire_changed_configs(old: Dict[str, Any], new: Dict[str, Any]) -> None:
+    """Mark pooled sessions of server configs that were edited or removed as retired."""
+    for name, cfg in old.items():
+        if isinstance(cfg, dict) and new.get(name) != cfg:
+            _retired_config_keys.add(_config_key(cfg))
+    for cfg in new.values():
+        if isinstance(cfg, dict):
+            _retired_config_keys.discard(_config_key(cfg))
+
+
 def _load_server_config(mcp_file: Path, mcp_name: str) -> Optional[Dict[str, Any]]:
     """Load server config from mcpServers JSON."""
-    if not mcp_file.exists():
-        return None
     try:
-        with open(mcp_file, "r") as f:
-            data = json.load(f)
-        servers = data.get("mcpServers", {})
+        servers = _read_servers(mcp_file)
+        if servers is None:
+            return None
         return servers.get(mcp_name)
     except Exception as e:
         logger.warning(f"Failed to load MCP config: {e}")
@@ -127,12 +303,10 @@ def _load_all_servers(mcp_file: Path) -> Dict[str, Dict[str, Any]]:
     """Load all server configs from mcpServers JSON. Only returns servers that are enabled
     (enabled != False). Disabled servers are excluded so they are not used by any model provider.
     """
-    if not mcp_file.exists():
-        return {}
     try:
-        with open(mcp_file, "r") as f:
-            data = json.load(f)
-        servers = data.get("mcpServers", {})
+        servers = _read_servers(mcp_file)
+        if servers is None:
+            return {}
         return {
             name: cfg
             for name, cfg in servers.items()
@@ -143,31 +317,243 @@ def _load_all_servers(mcp_file: Path) -> Dict[str, Dict[str, Any]]:
         return {}
 
 
-async def _list_tools_stdio(config: Dict[str, Any]) -> List[Tuple[str, str]]:
-    """Connect via stdio, list tools, return [(name, description), ...]."""
+def _server_headers(config: Dict[str, Any]) -> Dict[str, Any]:
+    """HTTP headers from a remote server config (dict or JSON string)."""
+    headers = config.get("headers") or {}
+    if isinstance(headers, str):
+        try:
+            headers = _json_loads(headers) if headers else {}
+        except ValueError:
+            headers = {}
+    return headers if isinstance(headers, dict) else {}
+
+
+def _effective_timeout(config: Dict[str, Any], default: int) -> int:
+    """Per-server timeout override (timeout_s), clamped to 5..300 seconds."""
+    try:
+        t_override = int(config.get("timeout_s", 0) or 0)
+    except Exception:
+        t_override = 0
+    return max(5, min(300, t_override or default))
+
+
+@contextlib.asynccontextmanager
+async def _open_session(config: Dict[str, Any]):
+    """Connect to a server (stdio or streamable HTTP) and yield an initialized ClientSession."""
+    if "url" in config:
+        if not STREAMABLE_HTTP_AVAILABLE:
+            raise RuntimeError("Remote MCP requires mcp package with streamable HTTP support")
+        mcp_url = _get_mcp_url(config)
+        if not mcp_url:
+            raise ValueError("Invalid URL in MCP server config")
+        http_client = _get_pooled_client(
+            _server_headers(config), timeout=float(_effective_timeout(config, 30))
+        )
+        async with streamable_http_client(mcp_url, http_client=http_client) as (
+            read,
+            write,
+            _,
+        ):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                yield session
+        return
     cmd = config.get("command", "")
-    args_list = normalize_mcp_args(config.get("args", []))
     if not cmd:
-        return []
+        raise ValueError("No command set for MCP server")
     server_params = StdioServerParameters(
         command=cmd,
-        args=[str(a) for a in args_list],
+        args=[str(a) for a in normalize_mcp_args(config.get("args", []))],
         env=_env_for_server(config),
     )
+    async with stdio_client(server_params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+
+def _config_key(config: Dict[str, Any]) -> str:
+    """Stable key for a server config; edited configs get a fresh session."""
+    return hashlib.sha256(_json_dumps_bytes(config, sort_keys=True)).hexdigest()
+
+
+class _PooledSession:
+    """One live ClientSession. The session is opened and closed inside its own task
+    because the MCP transports use anyio task groups that must exit in the task that
+    entered them."""
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        self.config = config
+        self.session: Optional[Any] = None
+        self.error: Optional[BaseException] = None
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        # stdio servers read one pipe and mostly handle requests one at a time; serialize
+        # calls per server so they don't queue up inside the subprocess and time out there.
+        # Streamable HTTP sessions take concurrent calls.
+        self.call_lock: Any = contextlib.nullcontext() if "url" in config else asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    @property
+    def closed(self) -> bool:
+        return self._closing.is_set() or self._task.done()
+
+    async def _run(self) -> None:
+        try:
+            async with _open_session(self.config) as session:
+                self.session = session
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def wait_ready(self) -> Any:
+        await self._ready.wait()
+        if self.session is None:
+            raise self.error or ConnectionError("MCP session closed")
+        return self.session
+
+    def close(self) -> None:
+        """Ask the owning task to shut the session down (does not wait)."""
+        self._closing.set()
+        if not self._ready.is_set():
+            # Still connecting/initializing: nothing to shut down cleanly
+            self._task.cancel()
+
+    async def aclose(self) -> None:
+        self.close()
+        await asyncio.wait({self._task})
+
+
+class MCPSessionPool:
+    """Keeps one initialized ClientSession per server config alive on an event loop,
+    so tool calls and listings skip the subprocess spawn / HTTP connect + initialize
+    handshake. A session that raises is discarded and reopened on next use."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _PooledSession] = {}
+
+    async def acquire(self, config: Dict[str, Any]) -> Any:
+        return (await self._acquire_entry(config))[1]
+
+    async def _acquire_entry(self, config: Dict[str, Any]) -> Tuple[_PooledSession, Any]:
+        if _retired_config_keys:
+            for stale in _retired_config_keys & self._entries.keys():
+                self._drop(stale, self._entries[stale])
+        key = _config_key(config)
+        entry = self._entries.get(key)
+        if entry is None or entry.closed:
+            entry = _PooledSession(config)
+            self._entries[key] = entry
+        try:
+            return entry, await entry.wait_ready()
+        except Exception:
+            # The connect failed; a cancelled waiter leaves it to the others
+            self._drop(key, entry)
+            raise
+
+    def _drop(self, key: str, entry: _PooledSession) -> None:
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.close()
+
+    def discard(self, config: Dict[str, Any]) -> None:
+        key = _config_key(config)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._drop(key, entry)
+
+    async def list_tools(self, config: Dict[str, Any]) -> Any:
+        entry, session = await self._acquire_entry(config)
+        try:
+            return await session.list_tools()
+        except asyncio.TimeoutError:
+            raise
+        except Exception:
+            # Only the failed session; a replacement another caller opened stays
+            self._drop(_config_key(config), entry)
+            raise
+
+    async def call_tool(
+        self,
+        config: Dict[str, Any],
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Call a tool on the pooled session. timeout bounds connecting plus the call
+        itself; time spent queued behind other calls to the same stdio server is not
+        counted. Cancelling the caller leaves the shared session open; session or
+        transport errors discard it, and so does a timeout on a stdio server, which may
+        be hung: the next call (or call_mcp_tool's retry) then spawns a fresh process."""
+        stdio = "url" not in config
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            entry, session = await asyncio.wait_for(self._acquire_entry(config), timeout)
+        except asyncio.TimeoutError:
+            if stdio:
+                self.discard(config)
+            raise
+        queued_at = loop.time()
+        async with entry.call_lock:
+            if timeout is not None:
+                timeout = max(0.0, timeout - (queued_at - started))
+            try:
+                return await asyncio.wait_for(session.call_tool(tool_name, arguments), timeout)
+            except asyncio.TimeoutError:
+                if stdio:
+                    self._drop(_config_key(config), entry)
+                raise
+            except Exception:
+                self._drop(_config_key(config), entry)
+                raise
+
+    async def aclose_all(self) -> None:
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            await entry.aclose()
+
+
+# Session pools per event loop (sessions cannot be used from another loop)
+_session_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, MCPSessionPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _session_pool() -> MCPSessionPool:
+    loop = asyncio.get_running_loop()
+    pool = _session_pools.get(loop)
+    if pool is None:
+        pool = _session_pools[loop] = MCPSessionPool()
+    return pool
+
+
+async def aclose_mcp_connections() -> None:
+    """Close pooled MCP sessions (stopping stdio servers) and HTTP clients of the
+    running event loop. Call before the loop is closed."""
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                tools_result = await session.list_tools()
-                out = []
-                for t in getattr(tools_result, "tools", []):
-                    name = getattr(t, "name", str(t))
-                    desc = getattr(t, "description", "") or ""
-                    out.append((name, desc))
-                return out
-    except Exception as e:
-        logger.debug(f"Tool discovery failed (stdio): {e}")
-        return []
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    pool = _session_pools.pop(loop, None)
+    if pool is not None:
+        await pool.aclose_all()
+    await aclose_http_clients()
+
+
+def _format_call_result(result: Any) -> str:
+    """Turn a CallToolResult into the text returned to the agent."""
+    parts = [
+        t for c in getattr(result, "content", None) or () if (t := getattr(c, "text", None)) is not None
+    ]
+    if getattr(result, "isError", False):
+        return f"**❌ Tool error:** {' '.join(parts) or 'Unknown error'}"
+    return "\n".join(parts) if parts else "(No output)"
 
 
 def _serialize_schema(obj: Any) -> Optional[Dict[str, Any]]:
@@ -186,8 +572,7 @@ def _serialize_schema(obj: Any) -> Optional[Dict[str, Any]]:
         pass
     try:
         if hasattr(obj, "model_dump_json") and callable(getattr(obj, "model_dump_json")):
-            import json as _json
-            return _json.loads(obj.model_dump_json())  # type: ignore[call-arg]
+            return _json_loads(obj.model_dump_json())  # type: ignore[call-arg]
     except Exception:
         pass
     # generic to_dict
@@ -204,165 +589,64 @@ def _serialize_schema(obj: Any) -> Optional[Dict[str, Any]]:
         return None
 
 
-async def _list_tools_stdio_full(config: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Connect via stdio, list tools with schemas, return [{name, description, input_schema}, ...]."""
-    cmd = config.get("command", "")
-    args_list = normalize_mcp_args(config.get("args", []))
-    if not cmd:
-        return []
-    server_params = StdioServerParameters(
-        command=cmd,
-        args=[str(a) for a in args_list],
-        env=_env_for_server(config),
-    )
-    try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                tools_result = await session.list_tools()
-                out: List[Dict[str, Any]] = []
-                for t in getattr(tools_result, "tools", []):
-                    name = getattr(t, "name", str(t))
-                    desc = getattr(t, "description", "") or ""
-                    schema = _serialize_schema(getattr(t, "inputSchema", None))
-                    out.append({"name": name, "description": desc, "input_schema": schema})
-                return out
-    except Exception as e:
-        logger.debug(f"Tool discovery (full) failed (stdio): {e}")
-        return []
-    server_params = StdioServerParameters(
-        command=cmd,
-        args=[str(a) for a in args_list],
-        env=_env_for_server(config),
-    )
+def _tool_pairs(tools_result: Any) -> List[Tuple[str, str]]:
+    """[(name, description), ...] from a ListToolsResult."""
+    return [
+        (getattr(t, "name", str(t)), getattr(t, "description", "") or "")
+        for t in getattr(tools_result, "tools", ())
+    ]
+
+
+def _tool_dicts(tools_result: Any) -> List[Dict[str, Any]]:
+    """[{name, description, input_schema}, ...] from a ListToolsResult."""
+    return [
+        {
+            "name": getattr(t, "name", str(t)),
+            "description": getattr(t, "description", "") or "",
+            "input_schema": _serialize_schema(getattr(t, "inputSchema", None)),
+        }
+        for t in getattr(tools_result, "tools", ())
+    ]
+
+
+async def _session_list_tools(config: Dict[str, Any], full: bool) -> Any:
+    """List tools over the pooled session for config (stdio or streamable HTTP).
+    Returns _tool_dicts(...) if full else _tool_pairs(...); [] on failure."""
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                tools_result = await session.list_tools()
-                out = []
-                for t in getattr(tools_result, "tools", []):
-                    name = getattr(t, "name", str(t))
-                    desc = getattr(t, "description", "") or ""
-                    out.append((name, desc))
-                return out
+        tools_result = await _session_pool().list_tools(config)
     except Exception as e:
-        logger.debug(f"Tool discovery failed (stdio): {e}")
+        transport = "http" if "url" in config else "stdio"
+        logger.debug(f"Tool discovery{' (full)' if full else ''} failed ({transport}): {e}")
         return []
+    return _tool_dicts(tools_result) if full else _tool_pairs(tools_result)
 
 
-async def _list_tools_http(config: Dict[str, Any]) -> List[Tuple[str, str]]:
-    """Connect via streamable HTTP, list tools, return [(name, description), ...]."""
-    if not STREAMABLE_HTTP_AVAILABLE:
-        return []
-    mcp_url = _get_mcp_url(config)
-    if not mcp_url:
+async def _list_tools_stdio(config: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """List tools over the pooled stdio session, return [(name, description), ...]."""
+    if not config.get("command", ""):
         return []
-    headers = config.get("headers") or {}
-    if isinstance(headers, str):
-        try:
-            headers = json.loads(headers) if headers else {}
-        except json.JSONDecodeError:
-            headers = {}
-    try:
-        import httpx
+    return await _session_list_tools(config, full=False)
 
-        # Allow moderate connection pooling for repeated calls
-        async with httpx.AsyncClient(
-            headers=headers,
-            timeout=httpx.Timeout(15.0),
-        ) as http_client:
-            async with streamable_http_client(mcp_url, http_client=http_client) as (
-                read,
-                write,
-                _,
-            ):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools_result = await session.list_tools()
-                    out = []
-                    for t in getattr(tools_result, "tools", []):
-                        name = getattr(t, "name", str(t))
-                        desc = getattr(t, "description", "") or ""
-                        out.append((name, desc))
-                    return out
-    except Exception as e:
-        logger.debug(f"Tool discovery failed (http): {e}")
+
+async def _list_tools_stdio_full(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """List tools with schemas over the pooled stdio session, return [{name, description, input_schema}, ...]."""
+    if not config.get("command", ""):
         return []
+    return await _session_list_tools(config, full=True)
 
 
-async def _list_tools_http_full(config: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Connect via streamable HTTP, list tools with schemas."""
-    if not STREAMABLE_HTTP_AVAILABLE:
-        return []
-    mcp_url = _get_mcp_url(config)
-    if not mcp_url:
+async def _list_tools_http(config: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """List tools over the pooled streamable HTTP session, return [(name, description), ...]."""
+    if not STREAMABLE_HTTP_AVAILABLE or not _get_mcp_url(config):
         return []
-    headers = config.get("headers") or {}
-    if isinstance(headers, str):
-        try:
-            headers = json.loads(headers) if headers else {}
-        except json.JSONDecodeError:
-            headers = {}
-    try:
-        import httpx
+    return await _session_list_tools(config, full=False)
 
-        async with httpx.AsyncClient(
-            headers=headers,
-            timeout=httpx.Timeout(15.0),
-        ) as http_client:
-            async with streamable_http_client(mcp_url, http_client=http_client) as (
-                read,
-                write,
-                _,
-            ):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools_result = await session.list_tools()
-                    out: List[Dict[str, Any]] = []
-                    for t in getattr(tools_result, "tools", []):
-                        name = getattr(t, "name", str(t))
-                        desc = getattr(t, "description", "") or ""
-                        schema = _serialize_schema(getattr(t, "inputSchema", None))
-                        out.append({"name": name, "description": desc, "input_schema": schema})
-                    return out
-    except Exception as e:
-        logger.debug(f"Tool discovery (full) failed (http): {e}")
-        return []
-    mcp_url = _get_mcp_url(config)
-    if not mcp_url:
-        return []
-    headers = config.get("headers") or {}
-    if isinstance(headers, str):
-        try:
-            headers = json.loads(headers) if headers else {}
-        except json.JSONDecodeError:
-            headers = {}
-    try:
-        import httpx
 
-        # Allow moderate connection pooling for repeated calls
-        async with httpx.AsyncClient(
-            headers=headers,
-            timeout=httpx.Timeout(15.0),
-        ) as http_client:
-            async with streamable_http_client(mcp_url, http_client=http_client) as (
-                read,
-                write,
-                _,
-            ):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    tools_result = await session.list_tools()
-                    out = []
-                    for t in getattr(tools_result, "tools", []):
-                        name = getattr(t, "name", str(t))
-                        desc = getattr(t, "description", "") or ""
-                        out.append((name, desc))
-                    return out
-    except Exception as e:
-        logger.debug(f"Tool discovery failed (http): {e}")
+async def _list_tools_http_full(config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """List tools with schemas over the pooled streamable HTTP session."""
+    if not STREAMABLE_HTTP_AVAILABLE or not _get_mcp_url(config):
         return []
+    return await _session_list_tools(config, full=True)
 
 
 def _get_mcp_url(config: Dict[str, Any]) -> str:
@@ -378,54 +662,17 @@ def _get_mcp_url(config: Dict[str, Any]) -> str:
 async def _call_tool_http(
     config: Dict[str, Any], tool_name: str, arguments: Dict[str, Any]
 ) -> str:
-    """Call MCP tool via streamable HTTP. Returns result text or error string."""
+    """Call MCP tool via the pooled streamable HTTP session. Returns result text or error string."""
     if not STREAMABLE_HTTP_AVAILABLE:
         return "**❌ Remote MCP requires mcp package with streamable HTTP support.**"
-    mcp_url = _get_mcp_url(config)
-    if not mcp_url:
+    if not _get_mcp_url(config):
         return "**❌ Invalid URL in MCP server config.**"
-    headers = config.get("headers") or {}
-    if isinstance(headers, str):
-        try:
-            headers = json.loads(headers) if headers else {}
-        except json.JSONDecodeError:
-            headers = {}
     try:
-        import httpx
-
-        # Per-server timeout override (clamped)
-        t_override = 0
-        try:
-            t_override = int(config.get("timeout_s", 0) or 0)
-        except Exception:
-            t_override = 0
-        effective_timeout = max(5, min(300, t_override or 30))
-
-        async with httpx.AsyncClient(
-            headers=headers,
-            timeout=httpx.Timeout(float(effective_timeout)),
-        ) as http_client:
-            async with streamable_http_client(mcp_url, http_client=http_client) as (
-                read,
-                write,
-                _,
-            ):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    result = await session.call_tool(tool_name, arguments)
-
-                    if getattr(result, "isError", False):
-                        err_parts = []
-                        for c in result.content:
-                            if hasattr(c, "text"):
-                                err_parts.append(c.text)
-                        return f"**❌ Tool error:** {' '.join(err_parts) or 'Unknown error'}"
-
-                    parts = []
-                    for content in result.content:
-                        if hasattr(content, "text"):
-                            parts.append(content.text)
-                    return "\n".join(parts) if parts else "(No output)"
+        effective_timeout = _effective_timeout(config, 30)
+        result = await _session_pool().call_tool(
+            config, tool_name, arguments, timeout=effective_timeout
+        )
+        return _format_call_result(result)
     except Exception as e:
         logger.exception(f"MCP HTTP tool call failed: {tool_name}")
         err_msg = str(e)
@@ -435,18 +682,186 @@ async def _call_tool_http(
         return f"**❌ Tool error:** {err_msg}"
 
 
+def _tools_cache_get(cache: Dict[Tuple[str, float], Tuple[float, Any]], key: Tuple[str, float]) -> Any:
+    """Return the cached discovery result for key, or None if missing or expired."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    expires_at, result = entry
+    if time.monotonic() >= expires_at:
+        cache.pop(key, None)
+        return None
+    return result
+
+
+def _tools_cache_put(
+    cache: Dict[Tuple[str, float], Tuple[float, Any]], key: Tuple[str, float], result: Any, any_failed: bool
+) -> None:
+    """Cache a discovery result for TOOLS_CACHE_TTL, or DISCOVERY_NEGATIVE_TTL if a server failed."""
+    now = time.monotonic()
+    ttl = TOOLS_CACHE_TTL if TOOLS_CACHE_TTL > 0 else math.inf
+    if len(cache) >= TOOLS_CACHE_PRESSURE_ENTRIES:
+        for k in [k for k, (expires_at, _) in cache.items() if expires_at <= now]:
+            del cache[k]
+        ttl = ttl / 2
+    if any_failed:
+        ttl = min(ttl, DISCOVERY_NEGATIVE_TTL)
+    cache[key] = (now + ttl, result)
+
+
+async def _single_flight(key: Tuple[Any, ...], factory) -> Any:
+    """Run factory() once per key on this loop; concurrent callers await the same task.
+    The task is shielded, so a caller timing out does not abort the shared discovery."""
+    loop = asyncio.get_running_loop()
+    flight_key = (id(loop),) + key
+    task = _discovery_inflight.get(flight_key)
+    if task is None:
+        task = loop.create_task(factory())
+        _discovery_inflight[flight_key] = task
+
+        def _done(t: "asyncio.Task") -> None:
+            if _discovery_inflight.get(flight_key) is t:
+                del _discovery_inflight[flight_key]
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
+
+def _resolve_path_str(mcp_file: Path) -> str:
+    """str(mcp_file.resolve()), memoized for absolute paths (relative ones depend on cwd)."""
+    if not mcp_file.is_absolute():
+        return str(mcp_file.resolve())
+    raw = str(mcp_file)
+    path_str = _resolved_paths.get(raw)
+    if path_str is None:
+        path_str = _resolved_paths[raw] = str(mcp_file.resolve())
+    return path_str
+
+
+def _tools_cache_key(mcp_file: Path, recheck: bool = False) -> Tuple[str, float]:
+    """(resolved path, mtime) for the discovery caches; the stat is reused for up to
+    MTIME_RECHECK_SECONDS (unless recheck) so back-to-back agent turns don't re-stat the file."""
+    path_str = _resolve_path_str(mcp_file)
+    now = time.monotonic()
+    checked = _mtime_cache.get(path_str)
+    if not recheck and checked is not None and now - checked[0] < MTIME_RECHECK_SECONDS:
+        return (path_str, checked[1])
+    try:
+        mtime = mcp_file.stat().st_mtime
+    except OSError:
+        mtime = 0
+    _mtime_cache[path_str] = (now, mtime)
+    return (path_str, mtime)
+
+
 def invalidate_tools_cache(mcp_file: Optional[Path] = None) -> None:
     """Invalidate discovery cache so the next discover_tools refetches. If mcp_file is None, clear all."""
     global _tools_cache
     if mcp_file is None:
         _tools_cache.clear()
+        _mtime_cache.clear()
+        _disk_cache_drop(None)
         return
-    path_str = str(mcp_file.resolve())
+    path_str = _resolve_path_str(mcp_file)
+    _mtime_cache.pop(path_str, None)
+    _disk_cache_drop(path_str)
     to_drop = [k for k in _tools_cache if k[0] == path_str]
     for k in to_drop:
         del _tools_cache[k]
 
 
+def tools_discovered(mcp_file: Path) -> bool:
+    """True once a discovery pass has cached tools for mcp_file in this process.
+    Background work (health checks) can wait until the agent actually needed MCP tools."""
+    path_str = _resolve_path_str(mcp_file)
+    return any(k[0] == path_str for k in _tools_cache) or any(
+        k[0] == path_str for k in _tools_cache_full
+    )
+
+
+def _servers_hash(servers: Dict[str, Dict[str, Any]]) -> str:
+    return hashlib.sha256(_json_dumps_bytes(servers, sort_keys=True)).hexdigest()
+
+
+def _read_disk_cache() -> Dict[str, Any]:
+    try:
+        with open(TOOLS_DISK_CACHE_PATH, "rb") as f:
+            data = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_disk_cache(data: Dict[str, Any]) -> None:
+    try:
+        TOOLS_DISK_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = TOOLS_DISK_CACHE_PATH.with_name(f"{TOOLS_DISK_CACHE_PATH.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(_json_dumps_bytes(data))
+        os.replace(tmp, TOOLS_DISK_CACHE_PATH)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Failed to write MCP tools cache: %s", e)
+
+
+def _disk_cache_get(
+    kind: str, cache_key: Tuple[str, float], servers: Dict[str, Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Persisted discovery result for (kind, mcp file), or None if missing or stale.
+    Serves each (kind, file, mtime) at most once per process."""
+    served_key = (kind,) + cache_key
+    if served_key in _disk_cache_served:
+        return None
+    _disk_cache_served.add(served_key)
+    entry = _read_disk_cache().get(f"{kind}:{cache_key[0]}")
+    if not isinstance(entry, dict):
+        return None
+    if entry.get("mtime") != cache_key[1] or entry.get("config_hash") != _servers_hash(servers):
+        return None
+    tools = entry.get("tools")
+    return tools if isinstance(tools, dict) else None
+
+
+def _disk_cache_put(
+    kind: str, cache_key: Tuple[str, float], servers: Dict[str, Dict[str, Any]], result: Dict[str, Any]
+) -> None:
+    data = _read_disk_cache()
+    data[f"{kind}:{cache_key[0]}"] = {
+        "config_hash": _servers_hash(servers),
+        "mtime": cache_key[1],
+        "tools": result,
+    }
+    _write_disk_cache(data)
+
+
+def _disk_cache_drop(path_str: Optional[str]) -> None:
+    """Forget persisted results for one resolved MCP file path (all files if None)."""
+    if path_str is None:
+        try:
+            TOOLS_DISK_CACHE_PATH.unlink()
+        except OSError:
+            pass
+        return
+    data = _read_disk_cache()
+    keys = [k for k in data if k.split(":", 1)[-1] == path_str]
+    if keys:
+        for k in keys:
+            del data[k]
+        _write_disk_cache(data)
+
+
+async def _run_structured(coros: List[Any]) -> List[Any]:
+    """
+    Run coroutines concurrently and return their results in order. Uses asyncio.TaskGroup
+    (3.11+) so an error or cancellation tears down every sibling (and its stdio subprocess);
+    falls back to gather on older Pythons.
+    """
+    task_group = getattr(asyncio, "TaskGroup", None)
+    if task_group is None:
+        return list(await asyncio.gather(*coros))
+    async with task_group() as tg:
+        tasks = [tg.create_task(c) for c in coros]
+    return [t.result() for t in tasks]
+
+
 async def _discover_one(
     name: str, config: Dict[str, Any]
 ) -> Tuple[str, List[Tuple[str, str]]]:
@@ -475,44 +890,60 @@ async def discover_tools(
     """
     Discover tools from all configured MCP servers.
     Returns {server_name: [(tool_name, description), ...]}.
-    Cached by mcp_file path and mtime unless force_refresh is True.
+    Cached by mcp_file path and mtime (and for TOOLS_CACHE_TTL) unless force_refresh is True;
+    healthy results also persist in TOOLS_DISK_CACHE_PATH across restarts.
     Runs servers in parallel with per-server timeout.
     """
     if not MCP_AVAILABLE:
         return {}
-    path_str = str(mcp_file.resolve())
-    try:
-        mtime = mcp_file.stat().st_mtime
-    except OSError:
-        mtime = 0
-    cache_key = (path_str, mtime)
-    if not force_refresh and cache_key in _tools_cache:
-        return _tools_cache[cache_key]
-    servers = _load_all_servers(mcp_file)
-    if not servers:
-        _tools_cache[cache_key] = {}
-        return {}
+    cache_key = _tools_cache_key(mcp_file, recheck=force_refresh)
+    if not force_refresh:
+        cached = _tools_cache_get(_tools_cache, cache_key)
+        if cached is not None:
+            return cached
+
+    async def _run():
+        servers = _load_all_servers(mcp_file)
+        if not servers:
+            _tools_cache_put(_tools_cache, cache_key, {}, any_failed=False)
+            return {}
+        if not force_refresh:
+            persisted = _disk_cache_get("tools", cache_key, servers)
+            if persisted is not None:
+                # JSON has no tuples; restore (name, description) pairs
+                restored = {name: [tuple(t) for t in tools] for name, tools in persisted.items()}
+                _tools_cache_put(_tools_cache, cache_key, restored, any_failed=False)
+                return restored
+
+        async def one_with_timeout(name: str, config: Dict[str, Any]) -> Tuple[str, List[Tuple[str, str]]]:
+            try:
+                return await asyncio.wait_for(
+                    _discover_one(name, config), timeout=DISCOVERY_SERVER_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning("MCP discovery timed out for server: %s", name)
+                return (name, [])
+            except Exception as e:
+                logger.debug("MCP discovery failed for %s: %s", name, e)
+                return (name, [])
+
+        results = await _run_structured(
+            [one_with_timeout(name, config) for name, config in servers.items()]
+        )
+        result: Dict[str, List[Tuple[str, str]]] = {}
+        any_failed = False
+        for name, tools in results:
+            if tools:
+                result[name] = tools
+            else:
+                any_failed = True
+        _tools_cache_put(_tools_cache, cache_key, result, any_failed)
+        if not any_failed:
+            _disk_cache_put("tools", cache_key, servers, result)
+        return result
 
-    async def one_with_timeout(name: str, config: Dict[str, Any]) -> Tuple[str, List[Tuple[str, str]]]:
-        try:
-            return await asyncio.wait_for(
-                _discover_one(name, config), timeout=DISCOVERY_SERVER_TIMEOUT
-            )
-        except asyncio.TimeoutError:
-            logger.warning("MCP discovery timed out for server: %s", name)
-            return (name, [])
-        except Exception as e:
-            logger.debug("MCP discovery failed for %s: %s", name, e)
-            return (name, [])
-
-    tasks = [one_with_timeout(name, config) for name, config in servers.items()]
-    results = await asyncio.gather(*tasks, return_exceptions=False)
-    result: Dict[str, List[Tuple[str, str]]] = {}
-    for name, tools in results:
-        if tools:
-            result[name] = tools
-    _tools_cache[cache_key] = result
-    return result
+    # Concurrent callers for the same file share one discovery pass
+    return await _single_flight(("tools",) + cache_key, _run)
 
 
 async def discover_tools_full(
@@ -521,43 +952,108 @@ async def discover_tools_full(
     """
     Discover tools with input schemas from all configured MCP servers.
     Returns {server_name: [{name, description, input_schema}], ...}.
-    Cached by mcp_file path and mtime unless force_refresh is True.
+    Cached by mcp_file path and mtime (and for TOOLS_CACHE_TTL) unless force_refresh is True.
     """
     if not MCP_AVAILABLE:
         return {}
-    path_str = str(mcp_file.resolve())
-    try:
-        mtime = mcp_file.stat().st_mtime
-    except OSError:
-        mtime = 0
-    cache_key = (path_str, mtime)
-    if not force_refresh and cache_key in _tools_cache_full:
-        return _tools_cache_full[cache_key]
+    cache_key = _tools_cache_key(mcp_file, recheck=force_refresh)
+    if not force_refresh:
+        cached = _tools_cache_get(_tools_cache_full, cache_key)
+        if cached is not None:
+            return cached
+
+    async def _run():
+        servers = _load_all_servers(mcp_file)
+        if not servers:
+            _tools_cache_put(_tools_cache_full, cache_key, {}, any_failed=False)
+            return {}
+        if not force_refresh:
+            persisted = _disk_cache_get("tools_full", cache_key, servers)
+            if persisted is not None:
+                _tools_cache_put(_tools_cache_full, cache_key, persisted, any_failed=False)
+                return persisted
+
+        async def one_with_timeout(name: str, config: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+            try:
+                return await asyncio.wait_for(
+                    _discover_one_full(name, config), timeout=DISCOVERY_SERVER_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.warning("MCP discovery (full) timed out for server: %s", name)
+                return (name, [])
+            except Exception as e:
+                logger.debug("MCP discovery (full) failed for %s: %s", name, e)
+                return (name, [])
+
+        results = await _run_structured(
+            [one_with_timeout(name, config) for name, config in servers.items()]
+        )
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        any_failed = False
+        for name, tools in results:
+            if tools:
+                result[name] = tools
+            else:
+                any_failed = True
+        _tools_cache_put(_tools_cache_full, cache_key, result, any_failed)
+        if not any_failed:
+            _disk_cache_put("tools_full", cache_key, servers, result)
+        return result
+
+    # Concurrent callers for the same file share one discovery pass
+    return await _single_flight(("tools_full",) + cache_key, _run)
+
+
+def _remember_tool_owner(key: Tuple[str, str], server: str) -> str:
+    _tool_owners.pop(key, None)
+    _tool_owners[key] = server
+    while len(_tool_owners) > TOOL_OWNERS_MAX_ENTRIES:
+        del _tool_owners[next(iter(_tool_owners))]
+    return server
+
+
+async def find_tool(mcp_file: Path, tool_name: str) -> Optional[str]:
+    """
+    Return the name of a configured server that advertises tool_name, or None.
+    Checks remembered owners and the discovery cache first; otherwise lists tools on
+    the remaining servers in parallel and returns on the first match, cancelling the rest.
+    """
+    if not MCP_AVAILABLE:
+        return None
     servers = _load_all_servers(mcp_file)
     if not servers:
-        _tools_cache_full[cache_key] = {}
-        return {}
-
-    async def one_with_timeout(name: str, config: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
-        try:
-            return await asyncio.wait_for(
-                _discover_one_full(name, config), timeout=DISCOVERY_SERVER_TIMEOUT
-            )
-        except asyncio.TimeoutError:
-            logger.warning("MCP discovery (full) timed out for server: %s", name)
-            return (name, [])
-        except Exception as e:
-            logger.debug("MCP discovery (full) failed for %s: %s", name, e)
-            return (name, [])
-
-    tasks = [one_with_timeout(name, config) for name, config in servers.items()]
-    results = await asyncio.gather(*tasks, return_exceptions=False)
-    result: Dict[str, List[Dict[str, Any]]] = {}
-    for name, tools in results:
-        if tools:
-            result[name] = tools
-    _tools_cache_full[cache_key] = result
-    return result
+        return None
+    cache_key = _tools_cache_key(mcp_file)
+    owner_key = (cache_key[0], tool_name)
+    owner = _tool_owners.get(owner_key)
+    if owner in servers:
+        return _remember_tool_owner(owner_key, owner)
+
+    cached = _tools_cache_get(_tools_cache, cache_key) or {}
+    for name, tools in cached.items():
+        if name in servers and any(t[0] == tool_name for t in tools):
+            return _remember_tool_owner(owner_key, name)
+    # Servers that answered in the cached pass don't have it; only probe the rest
+    pending = [(name, cfg) for name, cfg in servers.items() if name not in cached]
+    if not pending:
+        return None
+    tasks = [
+        asyncio.ensure_future(asyncio.wait_for(_discover_one(name, cfg), DISCOVERY_SERVER_TIMEOUT))
+        for name, cfg in pending
+    ]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            try:
+                name, tools = await fut
+            except Exception as e:
+                logger.debug("find_tool: probe failed: %s", e)
+                continue
+            if any(t[0] == tool_name for t in tools):
+                return _remember_tool_owner(owner_key, name)
+    finally:
+        for t in tasks:
+            t.cancel()
+    return None
 
 
 def refresh_tools_cache_background(mcp_file: Path) -> None:
@@ -568,14 +1064,13 @@ def refresh_tools_cache_background(mcp_file: Path) -> None:
         try:
             import asyncio as _asyncio
             async def _go():
-                try:
-                    await discover_tools(mcp_file, force_refresh=True)
-                except Exception:
-                    pass
-                try:
-                    await discover_tools_full(mcp_file, force_refresh=True)
-                except Exception:
-                    pass
+                # Both passes share the pooled sessions, so run them side by side
+                await _asyncio.gather(
+                    discover_tools(mcp_file, force_refresh=True),
+                    discover_tools_full(mcp_file, force_refresh=True),
+                    return_exceptions=True,
+                )
+                await aclose_mcp_connections()
             _asyncio.run(_go())
         except Exception:
             pass
@@ -714,11 +1209,16 @@ async def validate_server_config(config: Dict[str, Any]) -> Tuple[bool, str]:
             return False, "Invalid URL"
         try:
             import httpx
-            async with httpx.AsyncClient(timeout=5.0) as client:
+
+            client = _get_pooled_client({}, timeout=5.0)
+            # HEAD avoids a response body; MCP endpoints usually answer 405, which counts as up
+            try:
+                r = await client.head(url, timeout=3.0)
+            except httpx.TransportError:
                 r = await client.get(url)
-                if r.status_code in (200, 404, 405):
-                    return True, "Remote server reachable"
-                return False, f"HTTP {r.status_code}"
+            if r.status_code in (200, 404, 405):
+                return True, "Remote server reachable"
+            return False, f"HTTP {r.status_code}"
         except Exception as e:
             return False, str(e)
     cmd = config.get("command", "")
@@ -781,8 +1281,8 @@ async def call_mcp_tool(
     arguments: Dict[str, Any],
 ) -> str:
     """
-    Call an MCP tool. Spawns the server via stdio, calls the tool, returns result text.
-    Returns error message string on failure.
+    Call an MCP tool over a pooled session (the stdio server is spawned on first use),
+    returns result text. Returns error message string on failure.
     """
     if not MCP_AVAILABLE:
         return "**❌ MCP client not available.** Install with: pip install mcp"
@@ -819,58 +1319,34 @@ async def call_mcp_tool(
         return await _call_tool_http(config, tool_name, arguments)
 
     cmd = config.get("command", "")
-    args_list = normalize_mcp_args(config.get("args", []))
 
     if not cmd:
         return f"**❌ No command for MCP server '{mcp_name}'.**"
 
-    server_params = StdioServerParameters(
-        command=cmd,
-        args=args_list,
-        env=_env_for_server(config),
-    )
-
     async def _run_stdio_call() -> str:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                result = await session.call_tool(tool_name, arguments)
-
-                if getattr(result, "isError", False):
-                    err_parts = []
-                    for c in result.content:
-                        if hasattr(c, "text"):
-                            err_parts.append(c.text)
-                    return f"**❌ Tool error:** {' '.join(err_parts) or 'Unknown error'}"
-
-                parts = []
-                for content in result.content:
-                    if hasattr(content, "text"):
-                        parts.append(content.text)
-                return "\n".join(parts) if parts else "(No output)"
-
-    # Per-server timeout override (clamped)
-    t_override = 0
-    try:
-        t_override = int(config.get("timeout_s", 0) or 0)
-    except Exception:
-        t_override = 0
-    effective_timeout = max(5, min(300, t_override or DEFAULT_TOOL_CALL_TIMEOUT))
+        # Reuses the server process across calls; a failed session is discarded so
+        # the retry below spawns a fresh one.
+        result = await _session_pool().call_tool(
+            config, tool_name, arguments, timeout=effective_timeout
+        )
+        return _format_call_result(result)
+
+    effective_timeout = _effective_timeout(config, DEFAULT_TOOL_CALL_TIMEOUT)
 
     async def _call_with_retry() -> str:
         try:
-            return await asyncio.wait_for(_run_stdio_call(), timeout=effective_timeout)
+            return await _run_stdio_call()
         except FileNotFoundError:
             raise
         except (asyncio.TimeoutError, ConnectionError, OSError) as e:
             logger.warning("MCP transient error (will retry once): %s", e)
-            await asyncio.sleep(1.5)
-            return await asyncio.wait_for(_run_stdio_call(), timeout=effective_timeout)
+            await asyncio.sleep(random.uniform(*TOOL_CALL_RETRY_DELAY))
+            return await _run_stdio_call()
         except Exception as e:
             if "timeout" in str(e).lower() or "connection" in str(e).lower():
                 logger.warning("MCP transient error (will retry once): %s", e)
-                await asyncio.sleep(1.5)
-                return await asyncio.wait_for(_run_stdio_call(), timeout=effective_timeout)
+                await asyncio.sleep(random.uniform(*TOOL_CALL_RETRY_DELAY))
+                return await _run_stdio_call()
             raise
 
     try:
@@ -892,19 +1368,51 @@ async def call_mcp_tool(
         return f"**❌ Tool error:** {err_msg}"
 
 
-def discover_mcp_servers_zeroconf(timeout_seconds: float = 5.0) -> List[Dict[str, Any]]:
+async def call_mcp_tools_batch(
+    mcp_file: Path,
+    calls: List[Tuple[str, str, Dict[str, Any]]],
+) -> List[str]:
     """
-    Discover MCP servers on the local network via mDNS (ZeroConf).
-    Servers that advertise _mcp._tcp.local. will be listed.
-    Returns list of {"name": str, "host": str, "port": int}; empty if zeroconf not installed or none found.
+    Run several MCP tool calls, given as [(mcp_name, tool_name, arguments), ...].
+    Calls are grouped by server: different servers run in parallel, as do calls to one
+    remote (HTTP) server; calls to one stdio server run in order on its pooled session.
+    Returns result texts in input order (errors as strings, like call_mcp_tool).
+    """
+    groups: Dict[str, List[int]] = {}
+    for i, (mcp_name, _, _) in enumerate(calls):
+        groups.setdefault(mcp_name, []).append(i)
+    results: List[str] = [""] * len(calls)
+
+    async def _one(i: int) -> None:
+        mcp_name, tool_name, arguments = calls[i]
+        try:
+            results[i] = await call_mcp_tool(mcp_file, mcp_name, tool_name, arguments)
+        except Exception as e:
+            results[i] = f"**❌ Tool error:** {e}"
+
+    async def _group(mcp_name: str, indices: List[int]) -> None:
+        config = _load_server_config(mcp_file, mcp_name) or {}
+        if "url" in config:
+            await asyncio.gather(*(_one(i) for i in indices))
+        else:
+            for i in indices:
+                await _one(i)
+
+    await asyncio.gather(*(_group(name, indices) for name, indices in groups.items()))
+    return results
+
+
+def _start_zeroconf_browser(results: List[Dict[str, Any]], on_found: Any) -> Any:
+    """
+    Start an mDNS browser for _mcp._tcp.local. that appends to results and calls on_found()
+    after each hit. Returns the Zeroconf instance (caller must close it), or None if zeroconf
+    is not installed. Runs blocking socket setup, so call it off the event loop.
     """
     try:
         from zeroconf import Zeroconf, ServiceListener, ServiceBrowser
     except ImportError:
         logger.debug("zeroconf not installed; skipping MCP network discovery")
-        return []
-
-    results: List[Dict[str, Any]] = []
+        return None
 
     class MCPListener(ServiceListener):
         def add_service(self, zc: Any, type_: str, name: str) -> None:
@@ -917,14 +1425,83 @@ def discover_mcp_servers_zeroconf(timeout_seconds: float = 5.0) -> List[Dict[str
             port = info.port or 0
             if port:
                 results.append({"name": name.replace("._mcp._tcp.local.", ""), "host": host, "port": port})
+                on_found()
+
+    zc = Zeroconf()
+    ServiceBrowser(zc, "_mcp._tcp.local.", MCPListener())
+    return zc
+
+
+async def discover_mcp_servers_zeroconf_async(
+    timeout_seconds: float = 5.0,
+    max_results: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async mDNS discovery of MCP servers. Waits up to timeout_seconds without blocking the loop,
+    returning early once max_results servers have been found (None = wait the full window).
+    Returns list of {"name": str, "host": str, "port": int}.
+    """
+    loop = asyncio.get_running_loop()
+    results: List[Dict[str, Any]] = []
+    found = asyncio.Event()
+
+    def _on_found() -> None:
+        # Called from the zeroconf browser thread
+        if max_results and len(results) >= max_results:
+            loop.call_soon_threadsafe(found.set)
 
     try:
-        import time
-        zc = Zeroconf()
-        listener = MCPListener()
-        ServiceBrowser(zc, "_mcp._tcp.local.", listener)
-        time.sleep(timeout_seconds)
-        zc.close()
+        zc = await loop.run_in_executor(None, _start_zeroconf_browser, results, _on_found)
     except Exception as e:
         logger.debug("Zeroconf discovery error: %s", e)
-    return results
+        return []
+    if zc is None:
+        return []
+    try:
+        await asyncio.wait_for(found.wait(), timeout_seconds)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        try:
+            await loop.run_in_executor(None, zc.close)
+        except Exception as e:
+            logger.debug("Zeroconf close error: %s", e)
+    return list(results)
+
+
+def discover_mcp_servers_zeroconf(
+    timeout_seconds: float = 5.0,
+    max_results: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Discover MCP servers on the local network via mDNS (ZeroConf).
+    Servers that advertise _mcp._tcp.local. will be listed.
+    Returns list of {"name": str, "host": str, "port": int}; empty if zeroconf not installed or none found.
+    Returns early once max_results servers are found. Prefer discover_mcp_servers_zeroconf_async from async code.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(discover_mcp_servers_zeroconf_async(timeout_seconds, max_results))
+
+    # Called synchronously from a thread that already runs a loop: fall back to a thread wait
+    import threading
+
+    results: List[Dict[str, Any]] = []
+    found = threading.Event()
+
+    def _on_found() -> None:
+        if max_results and len(results) >= max_results:
+            found.set()
+
+    try:
+        zc = _start_zeroconf_browser(results, _on_found)
+        if zc is None:
+            return []
+        try:
+            found.wait(timeout_seconds)
+        finally:
+            zc.close()
+    except Exception as e:
+        logger.debug("Zeroconf discovery error: %s", e)
+    return list(results)
@@ -1,11 +1,15 @@
 """Media lifecycle management: storage, retention, pruning"""
 
+import hashlib
 import logging
 import os
 import sqlite3
+import threading
 import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -14,16 +18,35 @@ AUDIO_DIR = MEDIA_BASE / "audio"
 VIDEO_DIR = MEDIA_BASE / "video"
 IMAGES_DIR = MEDIA_BASE / "images"
 
+# One connection per thread (sqlite3 connections are not shared across threads)
+_local = threading.local()
+
 
 def _get_db_path() -> Path:
     return Path.home() / ".grizzyclaw" / "grizzyclaw.db"
 
 
+def _conn() -> sqlite3.Connection:
+    """This thread's connection to the media DB, opened once with WAL and the schema ensured."""
+    db_path = str(_get_db_path())
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != db_path:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _create_schema(conn)
+        _local.conn, _local.path = conn, db_path
+    return conn
+
+
 def _init_media_db():
     """Create media_assets table if not exists."""
-    db_path = _get_db_path()
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(str(db_path)) as conn:
+    _conn()
+
+
+def _create_schema(conn: sqlite3.Connection) -> None:
+    with conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS media_assets (
                 id TEXT PRIMARY KEY,
@@ -40,7 +63,73 @@ def _init_media_db():
         conn.execute("""
             CREATE INDEX IF NOT EXISTS idx_media_user ON media_assets(user_id)
         """)
-        conn.commit()
+    # Added later: file size at store time, so pruning can sum in SQL instead of stat()ing
+    # and content hash, so saving the same file twice reuses the stored copy
+    for column in ("size_bytes INTEGER", "content_hash TEXT"):
+        try:
+            with conn:
+                conn.execute(f"ALTER TABLE media_assets ADD COLUMN {column}")
+        except sqlite3.OperationalError:
+            pass  # column already exists
+    with conn:
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_media_hash ON media_assets(content_hash)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_media_path ON media_assets(path)")
+
+
+# Threads used to unlink pruned files
+PRUNE_WORKERS = 8
+
+# Max ids per DELETE ... IN (...) (SQLite's default variable limit is 999)
+DELETE_CHUNK = 500
+
+
+def _delete_assets(conn: sqlite3.Connection, asset_ids: List[str]) -> None:
+    for i in range(0, len(asset_ids), DELETE_CHUNK):
+        chunk = asset_ids[i:i + DELETE_CHUNK]
+        conn.execute(
+            f"DELETE FROM media_assets WHERE id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+
+
+def _safe_unlink(path: str) -> bool:
+    """Delete a media file; True if it existed and was removed."""
+    try:
+        p = Path(path)
+        if p.exists():
+            p.unlink()
+            return True
+    except OSError as e:
+        logger.debug(f"Could not delete {path}: {e}")
+    return False
+
+
+def _forget_missing_file(conn: sqlite3.Connection, path: str) -> None:
+    """Rows of a file found missing stop counting toward prune's size cap (size 0) and
+    stop being offered for deduplication."""
+    with conn:
+        conn.execute(
+            "UPDATE media_assets SET size_bytes = 0, content_hash = NULL WHERE path = ?",
+            (path,),
+        )
+
+
+def _content_hash(path: str) -> str:
+    """128-bit BLAKE2b of the file contents."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+        h = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
 
 
 def store_media(
@@ -48,6 +137,7 @@ def store_media(
     media_type: str,
     user_id: str,
     ttl_seconds: Optional[int] = None,
+    content_hash: Optional[str] = None,
 ) -> str:
     """
     Record a media asset in the database. Does not move/copy the file.
@@ -57,24 +147,26 @@ def store_media(
         media_type: "audio", "video", or "image"
         user_id: User identifier
         ttl_seconds: Optional time-to-live in seconds
+        content_hash: Optional content hash (lets later saves of the same file reuse it)
 
     Returns:
         Asset ID (UUID)
     """
-    _init_media_db()
     asset_id = str(uuid.uuid4())
     import time
     created_at = time.time()
-    db_path = _get_db_path()
-    with sqlite3.connect(str(db_path)) as conn:
+    resolved = str(Path(file_path).resolve())
+    size_bytes = _file_size(resolved)
+    conn = _conn()
+    with conn:
         conn.execute(
             """
-            INSERT INTO media_assets (id, path, type, user_id, created_at, ttl_seconds)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO media_assets
+                (id, path, type, user_id, created_at, ttl_seconds, size_bytes, content_hash)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (asset_id, str(Path(file_path).resolve()), media_type, user_id, created_at, ttl_seconds),
+            (asset_id, resolved, media_type, user_id, created_at, ttl_seconds, size_bytes, content_hash),
         )
-        conn.commit()
     return asset_id
 
 
@@ -86,6 +178,7 @@ def save_media_to_storage(
 ) -> Optional[str]:
     """
     Copy media to ~/.grizzyclaw/media/{type}/ and record in DB.
+    If identical content was already saved, the existing copy is reused.
 
     Args:
         source_path: Path to source file
@@ -107,9 +200,20 @@ def save_media_to_storage(
     ext = Path(source_path).suffix or ".bin"
     dest_path = dest_dir / f"{uuid.uuid4().hex}{ext}"
     try:
+        digest = _content_hash(source_path)
+        conn = _conn()
+        for (existing,) in conn.execute(
+            "SELECT DISTINCT path FROM media_assets WHERE content_hash = ? AND type = ?",
+            (digest, media_type),
+        ).fetchall():
+            if os.path.isfile(existing):
+                store_media(existing, media_type, user_id, ttl_seconds, content_hash=digest)
+                return existing
+            _forget_missing_file(conn, existing)
         import shutil
+        # copy2 already copies in-kernel (sendfile on Linux, fcopyfile on macOS) and keeps metadata
         shutil.copy2(source_path, dest_path)
-        store_media(str(dest_path), media_type, user_id, ttl_seconds)
+        store_media(str(dest_path), media_type, user_id, ttl_seconds, content_hash=digest)
         return str(dest_path)
     except Exception as e:
         logger.error(f"Failed to save media: {e}", exc_info=True)
@@ -134,57 +238,65 @@ def prune_media(
         Number of assets pruned
     """
     import time
-    _init_media_db()
     cutoff = time.time() - (retention_days * 86400)
-    db_path = _get_db_path()
-    pruned = 0
-    with sqlite3.connect(str(db_path)) as conn:
+    doomed_paths: List[str] = []
+    conn = _conn()
+    with conn:
         cursor = conn.execute(
             "SELECT id, path FROM media_assets WHERE created_at < ?",
             (cutoff,),
         )
         rows = cursor.fetchall()
-        for asset_id, path in rows:
-            try:
-                p = Path(path)
-                if p.exists():
-                    p.unlink()
-                    pruned += 1
-            except OSError as e:
-                logger.debug(f"Could not delete {path}: {e}")
-            conn.execute("DELETE FROM media_assets WHERE id = ?", (asset_id,))
+        _delete_assets(conn, [asset_id for asset_id, _ in rows])
+        # A file can back several rows (deduplicated saves); keep it while any remain
+        for path in {path for _, path in rows}:
+            if conn.execute(
+                "SELECT 1 FROM media_assets WHERE path = ? LIMIT 1", (path,)
+            ).fetchone() is None:
+                doomed_paths.append(path)
         conn.commit()
 
         # Enforce max size: delete oldest until under cap
         if max_size_mb > 0:
             max_bytes = max_size_mb * 1024 * 1024
-            cursor = conn.execute(
-                "SELECT id, path FROM media_assets ORDER BY created_at ASC"
-            )
-            rows = cursor.fetchall()
-            total = 0
-            for asset_id, path in rows:
-                try:
-                    p = Path(path)
-                    if p.exists():
-                        total += p.stat().st_size
-                except OSError:
-                    pass
-            for asset_id, path in rows:
-                if total <= max_bytes:
-                    break
-                try:
-                    p = Path(path)
-                    if p.exists():
-                        size = p.stat().st_size
-                        p.unlink()
-                        total -= size
-                        pruned += 1
-                except OSError as e:
-                    logger.debug(f"Could not delete {path}: {e}")
-                conn.execute("DELETE FROM media_assets WHERE id = ?", (asset_id,))
+            # Rows stored before size_bytes existed: record their size once
+            missing = conn.execute(
+                "SELECT id, path FROM media_assets WHERE size_bytes IS NULL"
+            ).fetchall()
+            if missing:
+                conn.executemany(
+                    "UPDATE media_assets SET size_bytes = ? WHERE id = ?",
+                    [(_file_size(path), asset_id) for asset_id, path in missing],
+                )
+            # Count each file once even if several rows share it
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM "
+                "(SELECT MAX(size_bytes) AS size FROM media_assets GROUP BY path)"
+            ).fetchone()[0]
+            if total > max_bytes:
+                cursor = conn.execute(
+                    "SELECT id, path, size_bytes FROM media_assets ORDER BY created_at ASC"
+                )
+                rows = cursor.fetchall()
+                refs = Counter(path for _, path, _ in rows)
+                doomed: List[str] = []
+                for asset_id, path, size in rows:
+                    if total <= max_bytes:
+                        break
+                    doomed.append(asset_id)
+                    refs[path] -= 1
+                    if refs[path] == 0:
+                        total -= size or 0
+                        doomed_paths.append(path)
+                _delete_assets(conn, doomed)
             conn.commit()
 
+    # Unlink outside the transaction; os.unlink releases the GIL so threads overlap the I/O
+    pruned = 0
+    if doomed_paths:
+        with ThreadPoolExecutor(max_workers=PRUNE_WORKERS) as ex:
+            pruned = sum(ex.map(_safe_unlink, doomed_paths))
+
     if pruned:
         logger.info(f"Pruned {pruned} media assets")
     return pruned
@@ -1,8 +1,11 @@
 """Audio transcription via Whisper (local) or OpenAI API"""
 
-import base64
+import binascii
+import functools
 import logging
+import os
 import tempfile
+import threading
 from pathlib import Path
 from typing import Optional, Union
 
@@ -36,13 +39,11 @@ def transcribe_audio(
         if isinstance(source, bytes):
             fd, tmp = tempfile.mkstemp(suffix=".mp3")
             try:
-                import os
                 os.write(fd, source)
                 os.close(fd)
                 path = Path(tmp)
                 cleanup_path = True
             except Exception:
-                import os
                 try:
                     os.close(fd)
                 except OSError:
@@ -52,41 +53,73 @@ def transcribe_audio(
                 raise
         elif isinstance(source, str):
             if source.startswith("data:"):
-                # Data URL
-                parts = source.split(",", 1)
-                b64_data = parts[1] if len(parts) > 1 else ""
-                raw = base64.b64decode(b64_data)
-                return transcribe_audio(raw, provider=provider, openai_api_key=openai_api_key)
-            path = Path(source).expanduser()
-            if not path.exists():
-                raise TranscriptionError(f"Audio file not found: {path}")
+                # Data URL: decode straight into a temp file, chunk by chunk, instead of
+                # materializing the decoded bytes and writing them out afterwards
+                path = Path(_decode_data_url_to_tempfile(source))
+                cleanup_path = True
+            else:
+                path = Path(source).expanduser()
+                try:
+                    path.stat()
+                except FileNotFoundError:
+                    raise TranscriptionError(f"Audio file not found: {path}")
         else:
             raise TranscriptionError("Invalid source type for transcription")
 
-        if not path or not path.exists():
-            raise TranscriptionError("No audio file to transcribe")
-
         if provider == "openai":
             return _transcribe_openai(path, openai_api_key)
         if provider == "local":
             return _transcribe_whisper_local(path)
         raise TranscriptionError(f"Unknown transcription provider: {provider}")
     finally:
-        if cleanup_path and path and path.exists():
+        if cleanup_path and path:
             try:
                 path.unlink()
+            except FileNotFoundError:
+                pass
             except OSError as e:
                 logger.debug(f"Could not remove temp file: {e}")
 
 
+# OpenAI transcription endpoint; the file is streamed as multipart from disk
+OPENAI_TRANSCRIPTIONS_URL = "https://api.openai.com/v1/audio/transcriptions"
+OPENAI_MAX_RETRIES = 3
+_RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+# Base64 characters decoded per write (multiple of 4 so chunks split on quantum boundaries)
+_B64_CHUNK = 4 * 256 * 1024
+
+
+def _decode_data_url_to_tempfile(data_url: str) -> str:
+    """Decode a base64 data URL into a new temp file; returns its path."""
+    parts = data_url.split(",", 1)
+    b64_data = parts[1] if len(parts) > 1 else ""
+    if any(c in b64_data for c in " \n\r\t"):
+        b64_data = "".join(b64_data.split())
+    fd, tmp = tempfile.mkstemp(suffix=".mp3")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for i in range(0, len(b64_data), _B64_CHUNK):
+                f.write(binascii.a2b_base64(b64_data[i:i + _B64_CHUNK]))
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return tmp
+
+
 def _transcribe_openai(path: Path, api_key: Optional[str]) -> str:
     """Transcribe using OpenAI Whisper API."""
     if not api_key:
         raise TranscriptionError("OpenAI API key required. Add it in Settings → Integrations.")
     try:
         import httpx
-        from openai import OpenAI
-
+    except ImportError:
+        raise TranscriptionError("httpx package required: pip install httpx")
+    try:
         # Use certifi for SSL (fixes connection errors in PyInstaller-frozen macOS app)
         verify = True
         try:
@@ -102,25 +135,42 @@ def _transcribe_openai(path: Path, api_key: Optional[str]) -> str:
         except Exception:
             pass
 
-        # 60s timeout for audio upload; 3 retries for transient connection errors
-        with httpx.Client(verify=verify, timeout=60.0) as http_client:
-            client = OpenAI(
-                api_key=api_key,
-                timeout=60.0,
-                max_retries=3,
-                http_client=http_client,
-            )
-            with open(path, "rb") as f:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=f,
-                )
-            return transcript.text if transcript else ""
-    except ImportError:
-        raise TranscriptionError("openai package required: pip install openai")
+        import mimetypes
+        import time
+        mime = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+        # 60s timeout for audio upload; 3 retries for transient connection errors.
+        # httpx reads the file handle in chunks, so large audio is never held in memory
+        # (the OpenAI SDK reads the whole file into bytes before uploading).
+        with httpx.Client(verify=verify, timeout=60.0) as http_client, open(path, "rb") as f:
+            for attempt in range(OPENAI_MAX_RETRIES + 1):
+                f.seek(0)
+                try:
+                    response = http_client.post(
+                        OPENAI_TRANSCRIPTIONS_URL,
+                        headers={"Authorization": f"Bearer {api_key}"},
+                        data={"model": "whisper-1"},
+                        files={"file": (path.name, f, mime)},
+                    )
+                except httpx.TransportError:
+                    if attempt >= OPENAI_MAX_RETRIES:
+                        raise
+                    time.sleep(0.5 * 2 ** attempt)
+                    continue
+                if response.status_code in _RETRY_STATUSES and attempt < OPENAI_MAX_RETRIES:
+                    time.sleep(0.5 * 2 ** attempt)
+                    continue
+                if response.status_code != 200:
+                    raise TranscriptionError(
+                        f"OpenAI transcription failed: HTTP {response.status_code} — {response.text[:200]}"
+                    )
+                return (response.json().get("text") or "").strip()
+        return ""
+    except TranscriptionError:
+        raise
     except Exception as e:
         err_msg = str(e).strip()
-        if "connection" in err_msg.lower() or "connect" in err_msg.lower():
+        if isinstance(e, httpx.TransportError) or "connection" in err_msg.lower() or "connect" in err_msg.lower():
             hint = (
                 "Connection error. Check: (1) Internet connection, (2) Firewall/VPN not blocking api.openai.com, "
                 "(3) Try Settings → Integrations → Transcription Provider → local (Whisper on device)."
@@ -130,16 +180,97 @@ def _transcribe_openai(path: Path, api_key: Optional[str]) -> str:
         raise TranscriptionError(f"OpenAI transcription failed: {e}") from e
 
 
+# Serializes first loads so concurrent transcriptions don't each deserialize the weights
+_whisper_lock = threading.Lock()
+# Set when loading Whisper on the GPU fails (common for mps); later loads go straight to
+# CPU instead of re-reading the weights and failing again on every transcription
+_whisper_gpu_failed = False
+
+
+def _whisper_device() -> str:
+    """Device for local Whisper: the best torch device, or cpu once a GPU load failed."""
+    return "cpu" if _whisper_gpu_failed else _torch_device()
+
+
+@functools.lru_cache(maxsize=1)
+def _torch_device() -> str:
+    """Best torch device: cuda, then Apple Silicon mps, else cpu."""
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    if torch.cuda.is_available():
+        return "cuda"
+    mps = getattr(torch.backends, "mps", None)
+    if mps is not None and mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+@functools.lru_cache(maxsize=2)
+def _load_whisper_model(name: str, device: str):
+    import whisper
+    return whisper.load_model(name, device=device)
+
+
+def _get_whisper_model(name: str = "base"):
+    """Local Whisper model on the best device, loaded once per process and reused.
+    Returns (model, device)."""
+    global _whisper_gpu_failed
+    with _whisper_lock:
+        device = _whisper_device()
+        if device != "cpu":
+            try:
+                return _load_whisper_model(name, device), device
+            except ImportError:
+                raise
+            except Exception as e:
+                _whisper_gpu_failed = True
+                logger.warning(f"Whisper on {device} unavailable ({e}); using CPU")
+        return _load_whisper_model(name, "cpu"), "cpu"
+
+
+@functools.lru_cache(maxsize=2)
+def _load_faster_whisper_model(name: str, device: str):
+    from faster_whisper import WhisperModel
+    # int8 weights: same accuracy, several times faster and about half the memory
+    compute_type = "int8_float16" if device == "cuda" else "int8"
+    return WhisperModel(name, device=device, compute_type=compute_type)
+
+
+def _get_faster_whisper_model(name: str = "base"):
+    """faster-whisper (CTranslate2) model, or None if faster-whisper is not installed."""
+    global _whisper_gpu_failed
+    with _whisper_lock:
+        # CTranslate2 has no MPS backend
+        device = "cuda" if _whisper_device() == "cuda" else "cpu"
+        try:
+            return _load_faster_whisper_model(name, device)
+        except ImportError:
+            return None
+        except Exception as e:
+            if device == "cpu":
+                raise
+            # torch sees CUDA but CTranslate2 may lack a usable CUDA/cuDNN build
+            _whisper_gpu_failed = True
+            logger.warning(f"faster-whisper on {device} unavailable ({e}); using CPU")
+        return _load_faster_whisper_model(name, "cpu")
+
+
 def _transcribe_whisper_local(path: Path) -> str:
-    """Transcribe using local Whisper model."""
+    """Transcribe using local Whisper model (faster-whisper if installed, else openai-whisper)."""
     try:
-        import whisper
-        model = whisper.load_model("base")
-        result = model.transcribe(str(path), fp16=False, language="en")
+        fw_model = _get_faster_whisper_model("base")
+        if fw_model is not None:
+            segments, _info = fw_model.transcribe(str(path), language="en")
+            return " ".join(seg.text.strip() for seg in segments).strip()
+        model, device = _get_whisper_model("base")
+        # fp16 only pays off (and is only supported) on CUDA
+        result = model.transcribe(str(path), fp16=(device == "cuda"), language="en")
         return result.get("text", "").strip() if result else ""
     except ImportError as e:
         raise TranscriptionError(
-            "openai-whisper not found. Run: pip install openai-whisper"
+            "Local Whisper not found. Run: pip install faster-whisper (or openai-whisper)"
         ) from e
     except Exception as e:
         if "ffmpeg" in str(e).lower():
@@ -1,9 +1,18 @@
 """Embedding providers for semantic memory. Tries sentence-transformers, OpenAI, then hash fallback."""
 from __future__ import annotations
 
+import asyncio
+import functools
 import hashlib
 import logging
-from typing import List, Optional
+import os
+import weakref
+from typing import Any, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -11,67 +20,249 @@ EMBEDDING_DIM = 384  # all-MiniLM-L6-v2; OpenAI uses 1536 but we standardize on
 
 _sentence_transformer = None
 
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+def _onnx_quantized_file() -> str:
+    """Dynamic-int8 ONNX export shipped in the model repo for this CPU family."""
+    import platform
+
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    return "onnx/model_quint8_avx2.onnx"
+
+
+def _load_onnx_sentence_transformer():
+    """ONNX Runtime backend (int8 if available): several times faster encode on CPU.
+    Needs onnxruntime and sentence-transformers >= 3.2; returns None otherwise."""
+    try:
+        import onnxruntime  # noqa: F401
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    for file_name in (_onnx_quantized_file(), "onnx/model.onnx"):
+        try:
+            return SentenceTransformer(EMBEDDING_MODEL, backend="onnx", model_kwargs={"file_name": file_name})
+        except Exception as e:
+            logger.debug(f"ONNX embedding model {file_name} unavailable: {e}")
+    return None
+
 
 def _get_sentence_transformer():
-    """Lazy-load sentence-transformers (optional dependency)."""
+    """Lazy-load sentence-transformers (optional dependency), preferring the ONNX backend."""
     global _sentence_transformer
     if _sentence_transformer is not None:
         return _sentence_transformer
+    _sentence_transformer = _load_onnx_sentence_transformer()
+    if _sentence_transformer is not None:
+        logger.info("Embeddings: sentence-transformers with ONNX Runtime backend")
+        return _sentence_transformer
     try:
         from sentence_transformers import SentenceTransformer
 
-        _sentence_transformer = SentenceTransformer("all-MiniLM-L6-v2")
+        _sentence_transformer = SentenceTransformer(EMBEDDING_MODEL)
+        try:
+            import torch
+
+            torch.set_num_threads(os.cpu_count() or 1)
+        except ImportError:
+            pass
         return _sentence_transformer
     except ImportError:
         return None
 
 
-async def embed_text(text: str, openai_api_key: Optional[str] = None) -> Optional[List[float]]:
-    """
-    Generate embedding for text. Tries: sentence-transformers -> OpenAI -> hash fallback.
-    Returns None if all fail. Hash fallback produces low-quality but deterministic vectors.
+# Concurrent encodes arriving within EMBED_BATCH_WINDOW seconds share one model.encode call
+EMBED_BATCH_SIZE = 32
+EMBED_BATCH_WINDOW = 0.005
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent sentence-transformer requests into batched encode calls.
+
+    SentenceTransformer cost is dominated by per-call overhead, so texts queued within a
+    short window are encoded together (sorted by length to minimize padding).
     """
-    # 1. Try sentence-transformers (local, no API)
-    model = _get_sentence_transformer()
-    if model is not None:
-        try:
-            # SentenceTransformer.encode is sync; run in executor to avoid blocking
-            import asyncio
 
-            loop = asyncio.get_event_loop()
-            vec = await loop.run_in_executor(None, lambda: model.encode(text, convert_to_numpy=True))
-            return [float(x) for x in vec.tolist()]
-        except Exception as e:
-            logger.debug(f"Sentence-transformer embed failed: {e}")
+    def __init__(self, model: Any, max_batch: int = EMBED_BATCH_SIZE, window: float = EMBED_BATCH_WINDOW):
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.window = window
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
 
-    # 2. Try OpenAI embeddings (when API key available)
-    if openai_api_key:
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue.put_nowait((text, fut))
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._drain())
+        return await fut
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._encode(batch)
+
+    async def _encode(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        texts = [text for text, _ in batch]
         try:
-            import aiohttp
+            if len(texts) == 1:
+                vecs = [await loop.run_in_executor(
+                    None,
+                    lambda: self.model.encode(texts[0], convert_to_numpy=True, normalize_embeddings=True),
+                )]
+            else:
+                order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+                encoded = await loop.run_in_executor(
+                    None,
+                    lambda: self.model.encode(
+                        [texts[i] for i in order],
+                        batch_size=self.max_batch,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                    ),
+                )
+                vecs = [None] * len(texts)
+                for i, row in zip(order, encoded):
+                    vecs[i] = row
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), vec in zip(batch, vecs):
+            if not fut.done():
+                fut.set_result([float(x) for x in vec.tolist()])
+
+
+_batchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, EmbeddingBatcher]" = (
+    weakref.WeakKeyDictionary()
+)
 
-            async with aiohttp.ClientSession() as session:
+
+def _get_batcher(model: Any) -> EmbeddingBatcher:
+    loop = asyncio.get_running_loop()
+    batcher = _batchers.get(loop)
+    if batcher is None or batcher.model is not model:
+        batcher = _batchers[loop] = EmbeddingBatcher(model)
+    return batcher
+
+
+def _fit_dim(vec: List[float]) -> List[float]:
+    # Safety net if the API ignores "dimensions": truncate/pad to 384
+    if len(vec) >= EMBEDDING_DIM:
+        return [float(x) for x in vec[:EMBEDDING_DIM]]
+    return [float(x) for x in vec] + [0.0] * (EMBEDDING_DIM - len(vec))
+
+
+# Inputs per /v1/embeddings request
+OPENAI_EMBED_BATCH = 128
+
+
+async def _embed_openai(texts: List[str], openai_api_key: str) -> Optional[List[List[float]]]:
+    """Embed texts with array-input requests of up to OPENAI_EMBED_BATCH; None on failure."""
+    try:
+        import aiohttp
+
+        from grizzyclaw.llm._pool import pooled_session
+
+        # Shared per-loop connector: repeated embeds reuse the TCP/TLS connection
+        async with pooled_session(timeout=aiohttp.ClientTimeout(total=30)) as session:
+
+            async def request(chunk: List[str]) -> Optional[List[List[float]]]:
                 async with session.post(
                     "https://api.openai.com/v1/embeddings",
                     headers={
                         "Content-Type": "application/json",
                         "Authorization": f"Bearer {openai_api_key}",
                     },
-                    json={"model": "text-embedding-3-small", "input": text[:8000]},
+                    # text-embedding-3 models shorten (and renormalize) to 384 dims server-side
+                    json={
+                        "model": "text-embedding-3-small",
+                        "input": [t[:8000] for t in chunk],
+                        "dimensions": EMBEDDING_DIM,
+                    },
                 ) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        vec = data["data"][0]["embedding"]
-                        # OpenAI text-embedding-3-small is 1536-dim; truncate/pad to 384 for compatibility
-                        if len(vec) >= EMBEDDING_DIM:
-                            return [float(x) for x in vec[:EMBEDDING_DIM]]
-                        return [float(x) for x in vec] + [0.0] * (EMBEDDING_DIM - len(vec))
-        except Exception as e:
-            logger.debug(f"OpenAI embed failed: {e}")
+                    if resp.status != 200:
+                        return None
+                    data = await resp.json()
+                    rows = sorted(data["data"], key=lambda d: d.get("index", 0))
+                    return [_fit_dim(d["embedding"]) for d in rows]
+
+            chunks = await asyncio.gather(*(
+                request(texts[i:i + OPENAI_EMBED_BATCH])
+                for i in range(0, len(texts), OPENAI_EMBED_BATCH)
+            ))
+        if any(c is None for c in chunks):
+            return None
+        return [vec for chunk in chunks for vec in chunk]
+    except Exception as e:
+        logger.debug(f"OpenAI embed failed: {e}")
+    return None
 
-    # 3. Hash fallback (deterministic but poor semantic quality)
+
+@functools.lru_cache(maxsize=4)
+def _hash_indices(dim: int):
+    """Byte indices (i % 32, (i + 1) % 32) for the hash fallback, built once per dim."""
+    idx = np.arange(dim, dtype=np.int32)
+    return idx % 32, (idx + 1) % 32
+
+
+def hash_embedding(text: str, dim: int = EMBEDDING_DIM) -> Optional[List[float]]:
+    """Hash fallback (deterministic but poor semantic quality)."""
     try:
-        h = hashlib.sha256(text.encode()).digest()
-        return [float((h[i % len(h)] ^ h[(i + 1) % len(h)]) / 255.0) for i in range(EMBEDDING_DIM)]
+        digest = hashlib.sha256(text.encode()).digest()
+        if np is None:
+            return [float((digest[i % 32] ^ digest[(i + 1) % 32]) / 255.0) for i in range(dim)]
+        idx, idx_next = _hash_indices(dim)
+        h = np.frombuffer(digest, dtype=np.uint8)
+        return ((h[idx] ^ h[idx_next]).astype(np.float32) * (1.0 / 255.0)).tolist()
     except Exception as e:
         logger.warning(f"Hash embed failed: {e}")
         return None
+
+
+async def embed_text(text: str, openai_api_key: Optional[str] = None) -> Optional[List[float]]:
+    """
+    Generate embedding for text. Tries: sentence-transformers -> OpenAI -> hash fallback.
+    Returns None if all fail. Hash fallback produces low-quality but deterministic vectors.
+    """
+    return (await embed_text_batch([text], openai_api_key))[0]
+
+
+async def embed_text_batch(
+    texts: List[str], openai_api_key: Optional[str] = None
+) -> List[Optional[List[float]]]:
+    """Embed several texts at once (one encode batch or one OpenAI request); same fallbacks as embed_text."""
+    if not texts:
+        return []
+    # 1. Try sentence-transformers (local, no API)
+    model = _get_sentence_transformer()
+    if model is not None:
+        try:
+            # Batched with any concurrent requests; encode runs in an executor
+            batcher = _get_batcher(model)
+            return list(await asyncio.gather(*(batcher.embed(t) for t in texts)))
+        except Exception as e:
+            logger.debug(f"Sentence-transformer embed failed: {e}")
+
+    # 2. Try OpenAI embeddings (when API key available)
+    if openai_api_key:
+        vecs = await _embed_openai(texts, openai_api_key)
+        if vecs is not None and len(vecs) == len(texts):
+            return vecs
+
+    # 3. Hash fallback
+    return [hash_embedding(t) for t in texts]
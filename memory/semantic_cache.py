@@ -0,0 +1,110 @@
+"""Semantic cache for memory searches: reuse results for near-duplicate queries."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Ring buffer of (query embedding -> search results), matched by cosine similarity.
+
+    A lookup returns the cached results of the most similar earlier query by the same
+    user with the same limit, if its similarity is at least ``threshold`` and it is
+    younger than ``ttl`` seconds. Needs NumPy; without it every lookup is a miss.
+    """
+
+    def __init__(self, capacity: int = 512, threshold: float = 0.95, ttl: float = 300.0):
+        self.capacity = max(1, capacity)
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # Per-slot arrays, allocated by the first put so lookups select with one mask:
+        # keys (capacity, dim) of L2-normalized embeddings, owners (user number, -1 =
+        # empty slot), limits and stamps
+        self._keys = None
+        self._owners = None
+        self._limits = None
+        self._stamps = None
+        self._values: List[Any] = [None] * self.capacity
+        # user_id -> small int stored in _owners
+        self._user_numbers: Dict[str, int] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: List[float]):
+        try:
+            import numpy as np
+        except ImportError:
+            return None
+        v = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else None
+
+    def get(self, user_id: str, embedding: List[float], limit: int) -> Optional[List[Any]]:
+        q = self._normalize(embedding)
+        with self._lock:
+            if q is None or self._keys is None or self._keys.shape[1] != q.shape[0]:
+                self.misses += 1
+                return None
+            import numpy as np
+
+            owner = self._user_numbers.get(user_id, -1)
+            best = -1
+            live = (
+                (self._owners == owner)
+                & (self._limits == limit)
+                & (self._stamps > time.monotonic() - self.ttl)
+            ) if owner >= 0 else None
+            if live is not None and live.any():
+                sims = np.where(live, self._keys @ q, -np.inf)
+                best = int(np.argmax(sims))
+                if sims[best] < self.threshold:
+                    best = -1
+            if best < 0:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return list(self._values[best])
+
+    def put(self, user_id: str, embedding: List[float], limit: int, results: List[Any]) -> None:
+        q = self._normalize(embedding)
+        if q is None:
+            return
+        import numpy as np
+
+        with self._lock:
+            if self._keys is None or self._keys.shape[1] != q.shape[0]:
+                self._keys = np.zeros((self.capacity, q.shape[0]), dtype=np.float32)
+                self._owners = np.full(self.capacity, -1, dtype=np.int64)
+                self._limits = np.zeros(self.capacity, dtype=np.int64)
+                self._stamps = np.zeros(self.capacity, dtype=np.float64)
+            owner = self._user_numbers.setdefault(user_id, len(self._user_numbers))
+            i = self._next
+            self._keys[i] = q
+            self._owners[i] = owner
+            self._limits[i] = limit
+            self._stamps[i] = time.monotonic()
+            self._values[i] = list(results)
+            self._next = (i + 1) % self.capacity
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop cached results for one user (after their memories change), or all."""
+        with self._lock:
+            if self._owners is None:
+                return
+            if user_id is None:
+                dropped = self._owners >= 0
+            else:
+                owner = self._user_numbers.get(user_id)
+                if owner is None:
+                    return
+                dropped = self._owners == owner
+            for i in dropped.nonzero()[0]:
+                self._values[i] = None
+            self._owners[dropped] = -1
@@ -1,24 +1,75 @@
+import asyncio
+import contextlib
 import json
 import logging
+import math
 import os
+import re
 import sqlite3
 import struct
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
 from .base import MemoryStore, MemoryItem, MemoryCategory
+from .semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
 # Embedding dimension (all-MiniLM-L6-v2)
 EMBEDDING_DIM = 384
 
+# orjson parses metadata 2-5x faster when installed
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _convert_timestamp(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode())
+
+
+# TIMESTAMP columns come back as datetimes (connections opened with PARSE_DECLTYPES).
+# Replaces sqlite3's default converter, which rejects the "+00:00" offset we store.
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+
+
+def _serialize_i8(vec: List[float]) -> bytes:
+    """L2-normalize and quantize to int8 (x127) for an int8[] sqlite-vec column.
+    A quarter of the float32 size; KNN order is preserved closely for unit vectors."""
+    if np is None:
+        norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+        return struct.pack(
+            f"{len(vec)}b", *(max(-127, min(127, round(x / norm * 127))) for x in vec)
+        )
+    # One float32 buffer; tobytes() is a single memcpy (no per-element varargs packing)
+    v = np.asarray(vec, dtype=np.float32)
+    scale = 127.0 / (float(np.linalg.norm(v)) or 1.0)
+    return np.clip(np.rint(v * scale), -127, 127).astype(np.int8).tobytes()
 
-def _serialize_f32(vec: List[float]) -> bytes:
-    """Serialize float list to binary for sqlite-vec."""
-    return struct.pack(f"{len(vec)}f", *vec)
+
+def _deserialize_f32(blob: bytes) -> List[float]:
+    """Float32 blob (legacy vec_memory rows) back to floats."""
+    if np is None:
+        return list(struct.unpack(f"{len(blob) // 4}f", blob))
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def _fts_match_query(query: str) -> str:
+    """FTS5 MATCH expression: every word as a quoted prefix term (implicit AND).
+    Quoting keeps FTS operators and punctuation in user text from being parsed."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
 
 
 class SQLiteMemoryStore(MemoryStore):
@@ -38,10 +89,56 @@ class SQLiteMemoryStore(MemoryStore):
         self.openai_api_key = openai_api_key
         self.use_semantic = use_semantic
         self._vec_available = False
+        self._fts_available = False
+        # Semantic results for recent queries; near-duplicate queries skip the KNN
+        self._query_cache = SemanticCache()
+        # One long-lived connection; the lock keeps statements (and BEGIN..COMMIT blocks)
+        # from interleaving when the store is used from sub-agent threads
+        self._lock = threading.RLock()
+        self._conn = self._connect()
+        # Queries run on this single worker so they never block the event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-db")
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")  # 64 MB page cache
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    async def _exec(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _query(self, sql: str, params: Any = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS memory_items (
                     id TEXT PRIMARY KEY,
@@ -69,31 +166,102 @@ class SQLiteMemoryStore(MemoryStore):
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_memory_category ON memory_items(category)
             """)
-            conn.commit()
+
+        # Full-text index for keyword search (FTS5 is compiled into nearly every SQLite build)
+        try:
+            with self._transaction() as conn:
+                self._create_fts(conn)
+            self._fts_available = True
+        except sqlite3.OperationalError as e:
+            logger.debug(f"FTS5 not available, keyword search uses LIKE: {e}")
 
         # Optional: sqlite-vec for semantic search
         if self.use_semantic:
             try:
                 import sqlite_vec
 
-                conn = sqlite3.connect(self.db_path)
-                conn.enable_load_extension(True)
-                sqlite_vec.load(conn)
-                conn.enable_load_extension(False)
-                conn.execute("""
-                    CREATE VIRTUAL TABLE IF NOT EXISTS vec_memory USING vec0(
-                        user_id TEXT PARTITION KEY,
-                        embedding float[384],
-                        +memory_id TEXT
-                    )
-                """)
-                conn.commit()
-                conn.close()
+                # Loaded once for the lifetime of the connection
+                self._conn.enable_load_extension(True)
+                sqlite_vec.load(self._conn)
+                self._conn.enable_load_extension(False)
+                with self._transaction() as conn:
+                    conn.execute("""
+                        CREATE VIRTUAL TABLE IF NOT EXISTS vec_memory_i8 USING vec0(
+                            user_id TEXT PARTITION KEY,
+                            embedding int8[384],
+                            +memory_id TEXT
+                        )
+                    """)
                 self._vec_available = True
                 logger.info("Semantic memory (sqlite-vec) enabled")
             except Exception as e:
                 logger.debug(f"sqlite-vec not available, using keyword search: {e}")
                 self._vec_available = False
+            if self._vec_available:
+                # A failed migration keeps the old table for the next start; it must not
+                # turn semantic search off
+                try:
+                    with self._transaction() as conn:
+                        self._migrate_f32_vectors(conn)
+                except Exception as e:
+                    logger.warning(f"Failed to migrate memory embeddings to int8: {e}")
+
+    def _create_fts(self, conn: sqlite3.Connection) -> None:
+        """External-content FTS5 index over memory_items.content, kept in sync by triggers."""
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'memory_fts'"
+        ).fetchone()
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+                content, content='memory_items', content_rowid='rowid', tokenize='unicode61'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_ai AFTER INSERT ON memory_items BEGIN
+                INSERT INTO memory_fts(rowid, content) VALUES (new.rowid, new.content);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_ad AFTER DELETE ON memory_items BEGIN
+                INSERT INTO memory_fts(memory_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS memory_fts_au AFTER UPDATE OF content ON memory_items BEGIN
+                INSERT INTO memory_fts(memory_fts, rowid, content) VALUES ('delete', old.rowid, old.content);
+                INSERT INTO memory_fts(rowid, content) VALUES (new.rowid, new.content);
+            END
+        """)
+        if not existed:
+            # Index memories stored before the FTS table existed
+            conn.execute("INSERT INTO memory_fts(memory_fts) VALUES ('rebuild')")
+
+    def _migrate_f32_vectors(self, conn: sqlite3.Connection) -> None:
+        """Move embeddings from the old float32 vec_memory table into vec_memory_i8."""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'vec_memory'"
+        ).fetchone()
+        if not exists:
+            return
+        # vec0 ignores OR IGNORE, so skip rows an earlier (interrupted) run already copied
+        rows = conn.execute(
+            """
+            SELECT rowid, user_id, embedding, memory_id FROM vec_memory
+            WHERE rowid NOT IN (SELECT rowid FROM vec_memory_i8)
+            """
+        ).fetchall()
+        conn.executemany(
+            """
+            INSERT INTO vec_memory_i8(rowid, user_id, embedding, memory_id)
+            VALUES (?, ?, vec_int8(?), ?)
+            """,
+            [
+                (rowid, user_id, _serialize_i8(_deserialize_f32(blob)), memory_id)
+                for rowid, user_id, blob, memory_id in rows
+            ],
+        )
+        conn.execute("DROP TABLE vec_memory")
+        logger.info(f"Migrated {len(rows)} memory embeddings to int8")
 
     async def add(
         self,
@@ -106,48 +274,31 @@ class SQLiteMemoryStore(MemoryStore):
         item_id = str(uuid.uuid4())
         now = datetime.now(timezone.utc)
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO memory_items (id, user_id, content, category, source, metadata, created_at, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    item_id,
-                    user_id,
-                    content,
-                    category,
-                    source,
-                    json.dumps(metadata) if metadata else None,
-                    now,
-                    now,
-                ),
-            )
-            rowid = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
-            conn.commit()
-
-            # Add embedding for semantic search
-            if self._vec_available:
-                try:
-                    from .embeddings import embed_text
-
-                    embedding = await embed_text(content[:8000], self.openai_api_key)
-                    if embedding and len(embedding) == EMBEDDING_DIM:
-                        import sqlite_vec
+        # Embed before taking the write lock so the transaction never spans an await
+        embedding = None
+        if self._vec_available:
+            try:
+                from .embeddings import embed_text
 
-                        conn.enable_load_extension(True)
-                        sqlite_vec.load(conn)
-                        conn.enable_load_extension(False)
-                        conn.execute(
-                            """
-                            INSERT INTO vec_memory(rowid, user_id, embedding, memory_id)
-                            VALUES (?, ?, ?, ?)
-                            """,
-                            (rowid, user_id, _serialize_f32(embedding), item_id),
-                        )
-                        conn.commit()
-                except Exception as e:
-                    logger.debug(f"Failed to add embedding: {e}")
+                embedding = await embed_text(content[:8000], self.openai_api_key)
+            except Exception as e:
+                logger.debug(f"Failed to embed memory: {e}")
+
+        await self._exec(
+            self._insert_item,
+            (
+                item_id,
+                user_id,
+                content,
+                category,
+                source,
+                json.dumps(metadata) if metadata else None,
+                now,
+                now,
+            ),
+            embedding,
+        )
+        self._query_cache.invalidate(user_id)
 
         return MemoryItem(
             id=item_id,
@@ -160,6 +311,109 @@ class SQLiteMemoryStore(MemoryStore):
             updated_at=now,
         )
 
+    def _insert_item(self, row: tuple, embedding: Optional[List[float]]) -> None:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO memory_items (id, user_id, content, category, source, metadata, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                row,
+            )
+
+            # Add embedding for semantic search
+            if embedding and len(embedding) == EMBEDDING_DIM:
+                try:
+                    conn.execute(
+                        """
+                        INSERT INTO vec_memory_i8(rowid, user_id, embedding, memory_id)
+                        VALUES (?, ?, vec_int8(?), ?)
+                        """,
+                        (cursor.lastrowid, row[1], _serialize_i8(embedding), row[0]),
+                    )
+                except Exception as e:
+                    logger.debug(f"Failed to add embedding: {e}")
+
+    async def add_many(
+        self, user_id: str, items: List[Dict[str, Any]]
+    ) -> List[MemoryItem]:
+        """Add several memories in one transaction, embedding them as one batch.
+
+        Each item is a dict with "content" and optional "category", "source", "metadata".
+        """
+        if not items:
+            return []
+        now = datetime.now(timezone.utc)
+        result = [
+            MemoryItem(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                content=item["content"],
+                category=item.get("category"),
+                source=item.get("source"),
+                metadata=item.get("metadata"),
+                created_at=now,
+                updated_at=now,
+            )
+            for item in items
+        ]
+
+        embeddings: List[Optional[List[float]]] = [None] * len(result)
+        if self._vec_available:
+            try:
+                from .embeddings import embed_text_batch
+
+                embeddings = await embed_text_batch(
+                    [m.content[:8000] for m in result], self.openai_api_key
+                )
+            except Exception as e:
+                logger.debug(f"Failed to embed memories: {e}")
+
+        await self._exec(
+            self._insert_items,
+            [
+                (
+                    m.id,
+                    user_id,
+                    m.content,
+                    m.category,
+                    m.source,
+                    json.dumps(m.metadata) if m.metadata else None,
+                    now,
+                    now,
+                )
+                for m in result
+            ],
+            [
+                (user_id, _serialize_i8(vec), m.id)
+                for m, vec in zip(result, embeddings)
+                if vec and len(vec) == EMBEDDING_DIM
+            ],
+        )
+        self._query_cache.invalidate(user_id)
+        return result
+
+    def _insert_items(self, rows: List[tuple], vec_rows: List[tuple]) -> None:
+        with self._transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO memory_items (id, user_id, content, category, source, metadata, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            if vec_rows:
+                try:
+                    conn.executemany(
+                        """
+                        INSERT INTO vec_memory_i8(rowid, user_id, embedding, memory_id)
+                        SELECT rowid, ?, vec_int8(?), id FROM memory_items WHERE id = ?
+                        """,
+                        vec_rows,
+                    )
+                except Exception as e:
+                    logger.debug(f"Failed to add embeddings: {e}")
+
     async def retrieve(
         self, user_id: str, query: str, limit: int = 10, category: Optional[str] = None
     ) -> List[MemoryItem]:
@@ -182,17 +436,16 @@ class SQLiteMemoryStore(MemoryStore):
     async def _retrieve_by_category(
         self, user_id: str, category: str, limit: int
     ) -> List[MemoryItem]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                """
-                SELECT * FROM memory_items
-                WHERE user_id = ? AND COALESCE(category, 'general') = ?
-                ORDER BY created_at DESC
-                LIMIT ?
-                """,
-                (user_id, category, limit),
-            ).fetchall()
+        rows = await self._exec(
+            self._query,
+            """
+            SELECT * FROM memory_items
+            WHERE user_id = ? AND COALESCE(category, 'general') = ?
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (user_id, category, limit),
+        )
         return self._rows_to_items(rows)
 
     async def _retrieve_semantic(
@@ -204,77 +457,79 @@ class SQLiteMemoryStore(MemoryStore):
         if not embedding or len(embedding) != EMBEDDING_DIM:
             return await self._retrieve_keyword(user_id, query, limit)
 
-        import sqlite_vec
+        cached = self._query_cache.get(user_id, embedding, limit)
+        if cached is not None:
+            return cached
+
+        # KNN and item lookup in one statement. MATERIALIZED keeps SQLite from flattening
+        # the CTE and pushing the join constraint onto memory_id, which vec0 rejects.
+        rows = await self._exec(
+            self._query,
+            """
+            WITH knn AS MATERIALIZED (
+                SELECT memory_id, distance
+                FROM vec_memory_i8
+                WHERE user_id = ? AND embedding MATCH vec_int8(?) AND k = ?
+            )
+            SELECT m.*, knn.distance
+            FROM knn JOIN memory_items m ON m.id = knn.memory_id
+            ORDER BY knn.distance
+            """,
+            (user_id, _serialize_i8(embedding), limit),
+        )
+        if not rows:
+            # No vectors yet (e.g. pre-existing memories) - fall back to keyword
+            return await self._retrieve_keyword(user_id, query, limit)
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.enable_load_extension(True)
-            sqlite_vec.load(conn)
-            conn.enable_load_extension(False)
-            conn.row_factory = sqlite3.Row
+        items = self._rows_to_items(rows)
+        self._query_cache.put(user_id, embedding, limit, items)
+        return items
 
-            # KNN search with partition filter
-            rows = conn.execute(
+    async def _retrieve_keyword(
+        self, user_id: str, query: str, limit: int
+    ) -> List[MemoryItem]:
+        match = _fts_match_query(query) if self._fts_available else ""
+        if match:
+            rows = await self._exec(
+                self._query,
                 """
-                SELECT v.memory_id, v.distance
-                FROM vec_memory v
-                WHERE v.user_id = ? AND v.embedding MATCH ? AND k = ?
-                ORDER BY v.distance
+                SELECT m.* FROM memory_fts
+                JOIN memory_items m ON m.rowid = memory_fts.rowid
+                WHERE memory_fts MATCH ? AND m.user_id = ?
+                ORDER BY memory_fts.rank
+                LIMIT ?
                 """,
-                (user_id, _serialize_f32(embedding), limit),
-            ).fetchall()
-
-            if not rows:
-                # No vectors yet (e.g. pre-existing memories) - fall back to keyword
-                return await self._retrieve_keyword(user_id, query, limit)
-
-            memory_ids = [r["memory_id"] for r in rows]
-            placeholders = ",".join("?" * len(memory_ids))
-            items_rows = conn.execute(
-                f"""
+                (match, user_id, limit),
+            )
+        elif query.strip():
+            # Escape LIKE special chars (% _ \) to prevent unintended wildcard matching
+            escaped = (
+                query.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            pattern = f"%{escaped}%"
+            rows = await self._exec(
+                self._query,
+                """
                 SELECT * FROM memory_items
-                WHERE id IN ({placeholders})
+                WHERE user_id = ? AND content LIKE ? ESCAPE '\\'
+                ORDER BY created_at DESC
+                LIMIT ?
                 """,
-                memory_ids,
-            ).fetchall()
-
-            # Preserve order by distance
-            id_to_row = {r["id"]: r for r in items_rows}
-            ordered = [id_to_row[mid] for mid in memory_ids if mid in id_to_row]
-
-        return self._rows_to_items(ordered)
-
-    async def _retrieve_keyword(
-        self, user_id: str, query: str, limit: int
-    ) -> List[MemoryItem]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            if query.strip():
-                # Escape LIKE special chars (% _ \) to prevent unintended wildcard matching
-                escaped = (
-                    query.replace("\\", "\\\\")
-                    .replace("%", "\\%")
-                    .replace("_", "\\_")
-                )
-                pattern = f"%{escaped}%"
-                rows = conn.execute(
-                    """
-                    SELECT * FROM memory_items
-                    WHERE user_id = ? AND content LIKE ? ESCAPE '\\'
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                    """,
-                    (user_id, pattern, limit),
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    """
-                    SELECT * FROM memory_items
-                    WHERE user_id = ?
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                    """,
-                    (user_id, limit),
-                ).fetchall()
+                (user_id, pattern, limit),
+            )
+        else:
+            rows = await self._exec(
+                self._query,
+                """
+                SELECT * FROM memory_items
+                WHERE user_id = ?
+                ORDER BY created_at DESC
+                LIMIT ?
+                """,
+                (user_id, limit),
+            )
         return self._rows_to_items(rows)
 
     def _rows_to_items(self, rows: List[sqlite3.Row]) -> List[MemoryItem]:
@@ -285,28 +540,26 @@ class SQLiteMemoryStore(MemoryStore):
                 content=row["content"],
                 category=row["category"] or "general",
                 source=row["source"],
-                metadata=json.loads(row["metadata"]) if row["metadata"] else None,
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
+                metadata=_json_loads(row["metadata"]) if row["metadata"] else None,
+                created_at=row["created_at"],
+                updated_at=row["updated_at"],
             )
             for row in rows
         ]
 
     async def get_categories(self, user_id: str) -> List[MemoryCategory]:
         """Derive categories from memory_items (category column)."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-
-            rows = conn.execute(
-                """
-                SELECT COALESCE(category, 'general') as category, COUNT(*) as item_count
-                FROM memory_items
-                WHERE user_id = ?
-                GROUP BY category
-                ORDER BY item_count DESC
-                """,
-                (user_id,),
-            ).fetchall()
+        rows = await self._exec(
+            self._query,
+            """
+            SELECT COALESCE(category, 'general') as category, COUNT(*) as item_count
+            FROM memory_items
+            WHERE user_id = ?
+            GROUP BY category
+            ORDER BY item_count DESC
+            """,
+            (user_id,),
+        )
 
         return [
             MemoryCategory(
@@ -319,7 +572,13 @@ class SQLiteMemoryStore(MemoryStore):
         ]
 
     async def delete(self, item_id: str) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
+        deleted = await self._exec(self._delete_item, item_id)
+        if deleted:
+            self._query_cache.invalidate()
+        return deleted
+
+    def _delete_item(self, item_id: str) -> bool:
+        with self._transaction() as conn:
             if self._vec_available:
                 try:
                     row = conn.execute(
@@ -327,26 +586,23 @@ class SQLiteMemoryStore(MemoryStore):
                     ).fetchone()
                     if row:
                         conn.execute(
-                            "DELETE FROM vec_memory WHERE rowid = ?", (row[0],)
+                            "DELETE FROM vec_memory_i8 WHERE rowid = ?", (row[0],)
                         )
                 except Exception as e:
                     logger.debug(f"Failed to delete vec row: {e}")
             cursor = conn.execute("DELETE FROM memory_items WHERE id = ?", (item_id,))
-            conn.commit()
-            return cursor.rowcount > 0
+        return cursor.rowcount > 0
 
     async def get_user_memory(self, user_id: str) -> Dict[str, Any]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-
-            total_items = conn.execute(
-                "SELECT COUNT(*) as count FROM memory_items WHERE user_id = ?",
-                (user_id,),
-            ).fetchone()["count"]
+        total_items = (await self._exec(
+            self._query,
+            "SELECT COUNT(*) as count FROM memory_items WHERE user_id = ?",
+            (user_id,),
+        ))[0]["count"]
 
-            categories = await self.get_categories(user_id)
+        categories = await self.get_categories(user_id)
 
-            recent_items = await self.retrieve(user_id, "", limit=5)
+        recent_items = await self.retrieve(user_id, "", limit=5)
 
         return {
             "total_items": total_items,
@@ -1,13 +1,37 @@
 """Proactive memory manager with embedding generation"""
 
 import logging
+import re
 from typing import List, Dict, Any, Optional
 import asyncio
 
 from .store import VectorStore
+from ..embeddings import hash_embedding
+from ..semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Dimension of the pgvector embedding columns (see VectorStore._init_schema)
+EMBEDDING_DIM = 1536
+
+# Runs of text between sentence terminators
+_SENT_RE = re.compile(r"[^.!?]+")
+# Preference words at the start of a word (prefer/preferred, like/likes, love, hate...)
+_PREF_RE = re.compile(r"\b(?:prefer|like|love|hate)", re.IGNORECASE)
+
+# Keyword-based categories for auto_categorize (substring match)
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "preferences": ["prefer", "like", "love", "favorite", "enjoy"],
+    "work": ["work", "job", "career", "project", "meeting"],
+    "personal": ["family", "friend", "home", "personal"],
+    "hobbies": ["hobby", "interest", "passion", "fun"]
+}
+_KEYWORD_CATEGORY = {kw: cat for cat, kws in CATEGORY_KEYWORDS.items() for kw in kws}
+# Every keyword in one scan; the lookahead also reports overlapping matches
+_CATEGORY_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in sorted(_KEYWORD_CATEGORY, key=len, reverse=True)) + "))"
+)
+
 
 class ProactiveMemory:
     """Proactive memory system with semantic search
@@ -27,6 +51,10 @@ class ProactiveMemory:
         """
         self.store = vector_store
         self.embedding_provider = embedding_provider
+        # Near-duplicate queries reuse recent results instead of re-running the vector search
+        self.search_cache = SemanticCache()
+        # Category names come from a fixed set; embed each once
+        self._category_embeddings: Dict[str, List[float]] = {}
 
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text
@@ -44,19 +72,10 @@ class ProactiveMemory:
             except Exception as e:
                 logger.error(f"Failed to generate embedding: {e}")
 
-        # Fallback: simple hash-based embedding (for testing)
-        # In production, use OpenAI embeddings or similar
-        import hashlib
-        hash_obj = hashlib.sha256(text.encode())
-        hash_bytes = hash_obj.digest()
-
-        # Convert to 1536-dim vector (OpenAI embedding size)
-        embedding = []
-        for i in range(1536):
-            byte_idx = i % len(hash_bytes)
-            embedding.append(float(hash_bytes[byte_idx]) / 255.0)
-
-        return embedding
+        # Fallback: shared hash-based embedding (for testing)
+        # In production, use OpenAI embeddings or similar.
+        # 1536 dims to match the pgvector columns (OpenAI embedding size)
+        return hash_embedding(text, EMBEDDING_DIM)
 
     async def store_conversation(
         self,
@@ -115,29 +134,33 @@ class ProactiveMemory:
         try:
             # Simple extraction: split into sentences
             # In production, use LLM to extract facts/preferences
-            sentences = [s.strip() for s in content.split('.') if s.strip()]
-
-            for sentence in sentences[:10]:  # Limit to 10 items per conversation
+            sentences = []
+            for match in _SENT_RE.finditer(content):
+                sentence = match.group().strip()
                 if len(sentence) > 20:  # Minimum length
-                    embedding = await self.generate_embedding(sentence)
-
-                    # Determine item type and importance
-                    item_type = "fact"
-                    importance = 0.5
-
-                    if any(word in sentence.lower() for word in ['prefer', 'like', 'love', 'hate']):
-                        item_type = "preference"
-                        importance = 0.8
-
-                    await self.store.add_item(
-                        user_id=user_id,
-                        item_type=item_type,
-                        content=sentence,
-                        embedding=embedding,
-                        resource_id=resource_id,
-                        importance=importance
-                    )
-
+                    sentences.append(sentence)
+                    if len(sentences) >= 10:  # Limit to 10 items per conversation
+                        break
+
+            # Embed all sentences concurrently so a batching provider can coalesce them
+            embeddings = await asyncio.gather(*(self.generate_embedding(s) for s in sentences))
+
+            items = []
+            for sentence, embedding in zip(sentences, embeddings):
+                # Determine item type and importance
+                is_preference = _PREF_RE.search(sentence) is not None
+                items.append({
+                    "item_type": "preference" if is_preference else "fact",
+                    "importance": 0.8 if is_preference else 0.5,
+                    "content": sentence,
+                    "embedding": embedding,
+                    "resource_id": resource_id,
+                })
+
+            # One transaction for all items
+            await self.store.add_items(user_id, items)
+
+            self.search_cache.invalidate(user_id)
             logger.info(f"Extracted items from resource {resource_id}")
 
         except Exception as e:
@@ -162,6 +185,10 @@ class ProactiveMemory:
         # Generate query embedding
         query_embedding = await self.generate_embedding(query)
 
+        cached = self.search_cache.get(user_id, query_embedding, limit)
+        if cached is not None:
+            return cached
+
         # Search items
         results = await self.store.semantic_search(
             user_id=user_id,
@@ -171,6 +198,7 @@ class ProactiveMemory:
         )
 
         logger.info(f"Memory search for '{query[:50]}...' returned {len(results)} results")
+        self.search_cache.put(user_id, query_embedding, limit, results)
 
         return results
 
@@ -216,20 +244,15 @@ class ProactiveMemory:
         """
         # Simple keyword-based categorization
         # In production, use LLM or clustering
+        matched = {_KEYWORD_CATEGORY[m.group(1)] for m in _CATEGORY_RE.finditer(item_text.lower())}
 
-        categories = {
-            "preferences": ["prefer", "like", "love", "favorite", "enjoy"],
-            "work": ["work", "job", "career", "project", "meeting"],
-            "personal": ["family", "friend", "home", "personal"],
-            "hobbies": ["hobby", "interest", "passion", "fun"]
-        }
-
-        item_lower = item_text.lower()
-
-        for category_name, keywords in categories.items():
-            if any(keyword in item_lower for keyword in keywords):
+        for category_name in CATEGORY_KEYWORDS:
+            if category_name in matched:
                 # Create or get category
-                embedding = await self.generate_embedding(category_name)
+                embedding = self._category_embeddings.get(category_name)
+                if embedding is None:
+                    embedding = await self.generate_embedding(category_name)
+                    self._category_embeddings[category_name] = embedding
 
                 category_id = await self.store.create_category(
                     user_id=user_id,
@@ -276,11 +299,8 @@ class ProactiveMemory:
 
         to_remove = total - max_items
         candidates = await self.store.list_items_for_compaction(user_id, limit=to_remove + 100)
-        deleted = 0
-        for item in candidates[:to_remove]:
-            if await self.store.delete_item(item["id"]):
-                deleted += 1
-            if deleted >= to_remove:
-                break
+        deleted = await self.store.delete_items([item["id"] for item in candidates[:to_remove]])
 
+        if deleted:
+            self.search_cache.invalidate(user_id)
         logger.info(f"Memory compaction for user {user_id}: removed {deleted} items (kept {total - deleted})")
@@ -4,16 +4,165 @@ This implements memU-style proactive memory with three-layer hierarchy:
 - Resources: Original data sources (conversations, documents)
 - Items: Extracted facts and preferences
 - Categories: Auto-organized topics
+
+Deployment: for large stores, size the server so the HNSW graphs stay in memory:
+shared_buffers of about 1.2x the HNSW index size (pg_relation_size of the
+idx_*_embedding_* indexes), effective_cache_size of about 70% of RAM, and
+huge_pages=on so the graph sits in 2 MB pages (fewer TLB misses while it is
+walked). track_io_timing=on shows in EXPLAIN (ANALYZE, BUFFERS) whether searches
+are waiting on reads. pgvector >= 0.8 enables iterative index scans (see
+VectorStore.semantic_search).
 """
 
+import array
+import contextlib
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 import asyncpg
-import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Embeddings are stored as halfvec (FP16): half the bytes of vector (FP32) for the
+# table, the HNSW index and the buffer cache, with negligible recall loss
+EMBEDDING_TYPE = "halfvec(1536)"
+EMBEDDING_TABLES = ("resources", "items", "categories")
+
+# semantic_search profiles: (candidate overfetch multiplier, hnsw.ef_search).
+# Candidates come from a binary-quantized HNSW index (Hamming distance on 192-byte
+# codes) and are reranked by exact cosine on the halfvec embeddings.
+SEARCH_PROFILES = {
+    "fast": (4, 40),
+    "balanced": (10, 100),
+    "recall_max": (20, 200),
+}
+HNSW_MAX_EF_SEARCH = 1000
+
+# HNSW build parameters (m, ef_construction) per profile; the profile is chosen from
+# the table's row count unless VectorStore(ann_profile=...) pins one
+HNSW_BUILD_PARAMS = {
+    "fast": (16, 64),
+    "balanced": (24, 100),
+    "recall_max": (32, 128),
+}
+ANN_PROFILE_TIERS = (
+    (100_000, "fast"),
+    (1_000_000, "balanced"),
+)
+# Indexes are rebuilt with the tier's parameters once a table grows this many times over
+ANN_REBUILD_GROWTH = 10
+HNSW_MAINTENANCE_WORK_MEM = "2GB"
+
+# Exact-repeat cache in front of semantic_search (UI re-renders, retries)
+DEFAULT_SEARCH_CACHE_TTL = 30.0
+DEFAULT_SEARCH_CACHE_MAX_ENTRIES = 10_000
+
+
+# Hot-path statements, prepared once per pool connection (see VectorStore._prepared)
+_ADD_RESOURCE_SQL = """
+    INSERT INTO resources (user_id, resource_type, content, embedding, metadata)
+    VALUES ($1, $2, $3, $4::halfvec, $5)
+    RETURNING id
+"""
+_ADD_ITEM_SQL = """
+    INSERT INTO items (user_id, resource_id, item_type, content,
+                     importance, embedding, metadata)
+    VALUES ($1, $2, $3, $4, $5, $6::halfvec, $7)
+    RETURNING id
+"""
+# Multi-row inserts with ids back in input order (one array parameter per column)
+_INSERT_RESOURCES_SQL = """
+    INSERT INTO resources (user_id, resource_type, content, embedding, metadata)
+    SELECT r.user_id, r.resource_type, r.content, r.embedding, r.metadata
+    FROM unnest($1::text[], $2::text[], $3::text[], $4::halfvec[], $5::jsonb[])
+         WITH ORDINALITY AS r(user_id, resource_type, content, embedding, metadata, n)
+    ORDER BY r.n
+    RETURNING id
+"""
+_INSERT_ITEMS_SQL = """
+    INSERT INTO items (user_id, resource_id, item_type, content,
+                     importance, embedding, metadata)
+    SELECT r.user_id, r.resource_id, r.item_type, r.content,
+           r.importance, r.embedding, r.metadata
+    FROM unnest($1::text[], $2::int[], $3::text[], $4::text[],
+                $5::float8[], $6::halfvec[], $7::jsonb[])
+         WITH ORDINALITY AS r(user_id, resource_id, item_type, content,
+                              importance, embedding, metadata, n)
+    ORDER BY r.n
+    RETURNING id
+"""
+_SEARCH_SQL = {
+    table: f"""
+        SELECT id, content, metadata,
+               1 - (embedding <=> $1::halfvec) as similarity
+        FROM (
+            SELECT id, content, metadata, embedding
+            FROM {table}
+            WHERE user_id = $2
+            ORDER BY binary_quantize(embedding)::bit(1536) <~> binary_quantize($1::halfvec)
+            LIMIT $4
+        ) candidates
+        ORDER BY embedding <=> $1::halfvec
+        LIMIT $3
+    """
+    for table in ("items", "resources")
+}
+
+
+class _VectorConnection(asyncpg.Connection):
+    """Pool connection that keeps its prepared statements for the store's hot paths"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: Dict[str, Any] = {}
+
+
+class VectorBatch:
+    """Writes queued inside VectorStore.batch(), inserted together when the block exits.
+
+    After the block, resource_ids and item_ids hold the new ids in queue order.
+    """
+
+    def __init__(self):
+        self.resources: List[Tuple] = []
+        self.items: List[Tuple] = []
+        self.resource_ids: List[int] = []
+        self.item_ids: List[int] = []
+
+    def add_resource(
+        self,
+        user_id: str,
+        resource_type: str,
+        content: str,
+        embedding: List[float],
+        metadata: Optional[Dict] = None
+    ) -> None:
+        self.resources.append((user_id, resource_type, content, embedding, metadata or {}))
+
+    def add_item(
+        self,
+        user_id: str,
+        item_type: str,
+        content: str,
+        embedding: List[float],
+        resource_id: Optional[int] = None,
+        importance: float = 0.5,
+        metadata: Optional[Dict] = None
+    ) -> None:
+        self.items.append(
+            (user_id, resource_id, item_type, content, importance, embedding, metadata or {})
+        )
+
+
+def _ann_profile_for_rows(row_count: int) -> str:
+    for max_rows, profile in ANN_PROFILE_TIERS:
+        if row_count < max_rows:
+            return profile
+    return "recall_max"
+
 
 class VectorStore:
     """PostgreSQL + pgvector store for semantic memory"""
@@ -24,7 +173,10 @@ class VectorStore:
         port: int = 5432,
         database: str = "grizzyclaw",
         user: str = "grizzyclaw",
-        password: str = "grizzyclaw"
+        password: str = "grizzyclaw",
+        ann_profile: Optional[str] = None,
+        search_cache_ttl: float = DEFAULT_SEARCH_CACHE_TTL,
+        partitions: int = 0
     ):
         """Initialize vector store
 
@@ -34,6 +186,13 @@ class VectorStore:
             database: Database name
             user: Database user
             password: Database password
+            ann_profile: 'fast', 'balanced' or 'recall_max' to pin the HNSW index and
+                search parameters; None picks them from each table's row count
+            search_cache_ttl: Seconds a semantic_search result is reused for the
+                identical query; 0 disables the cache
+            partitions: Hash-partition newly created resources and items tables by
+                user_id into this many partitions (e.g. 32; each gets its own, smaller
+                HNSW graphs); 0 keeps one table each. Existing tables are not converted.
         """
         self.host = host
         self.port = port
@@ -41,6 +200,20 @@ class VectorStore:
         self.user = user
         self.password = password
         self.pool: Optional[asyncpg.Pool] = None
+        self.ann_profile = ann_profile if ann_profile in HNSW_BUILD_PARAMS else None
+        # Profile the HNSW indexes of each table were built with (see _configure_ann)
+        self._table_profiles: Dict[str, str] = {}
+        self.search_cache_ttl = search_cache_ttl
+        self._search_cache: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        # Writes bump the user's generation, orphaning their cached results (evicted by LRU)
+        self._search_generations: Dict[str, int] = {}
+        self.partitions = max(0, partitions)
+        # Set by _init_schema; nothing can reference the id of a partitioned table (its
+        # keys include user_id), so those tables have no FKs or cascades pointing at them
+        self._resources_partitioned = False
+        self._items_partitioned = False
+        # Set by _init_schema: pgvector >= 0.8 has hnsw.iterative_scan
+        self._iterative_scan = False
 
     async def connect(self):
         """Connect to PostgreSQL and setup pgvector"""
@@ -55,7 +228,9 @@ class VectorStore:
                 user=self.user,
                 password=self.password,
                 min_size=2,
-                max_size=10
+                max_size=10,
+                init=self._init_connection,
+                connection_class=_VectorConnection
             )
 
             # Initialize schema
@@ -73,40 +248,54 @@ class VectorStore:
             await self.pool.close()
             logger.info("✓ Disconnected from PostgreSQL")
 
+    async def _init_connection(self, conn: asyncpg.Connection):
+        """Per-connection setup: register pgvector codecs so embeddings (lists or
+        numpy arrays, passed as-is) are sent in binary as vector/halfvec"""
+        # The extension must exist before its types can be registered
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        try:
+            from pgvector.asyncpg import register_vector
+        except ImportError:
+            logger.warning("pgvector package not installed: pip install pgvector")
+            return
+        await register_vector(conn)
+
     async def _init_schema(self):
         """Initialize database schema with pgvector"""
         async with self.pool.acquire() as conn:
             # Enable pgvector extension
             await conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+            version = await conn.fetchval(
+                "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+            )
+            try:
+                self._iterative_scan = tuple(int(part) for part in version.split(".")[:2]) >= (0, 8)
+            except (AttributeError, ValueError):
+                self._iterative_scan = False
 
             # Create resources table (original data)
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS resources (
-                    id SERIAL PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    resource_type TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    metadata JSONB DEFAULT '{}',
-                    embedding vector(1536),
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    updated_at TIMESTAMP DEFAULT NOW()
-                )
+            self._resources_partitioned = await self._create_user_table(conn, "resources", """
+                user_id TEXT NOT NULL,
+                resource_type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                metadata JSONB DEFAULT '{}',
+                embedding halfvec(1536),
+                created_at TIMESTAMP DEFAULT NOW(),
+                updated_at TIMESTAMP DEFAULT NOW()
             """)
 
             # Create items table (extracted facts/preferences)
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS items (
-                    id SERIAL PRIMARY KEY,
-                    user_id TEXT NOT NULL,
-                    resource_id INTEGER REFERENCES resources(id),
-                    item_type TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    importance FLOAT DEFAULT 0.5,
-                    metadata JSONB DEFAULT '{}',
-                    embedding vector(1536),
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    accessed_at TIMESTAMP DEFAULT NOW()
-                )
+            resource_ref = "" if self._resources_partitioned else " REFERENCES resources(id)"
+            self._items_partitioned = await self._create_user_table(conn, "items", f"""
+                user_id TEXT NOT NULL,
+                resource_id INTEGER{resource_ref},
+                item_type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                importance FLOAT DEFAULT 0.5,
+                metadata JSONB DEFAULT '{{}}',
+                embedding halfvec(1536),
+                created_at TIMESTAMP DEFAULT NOW(),
+                accessed_at TIMESTAMP DEFAULT NOW()
             """)
 
             # Create categories table (auto-organized topics)
@@ -116,17 +305,20 @@ class VectorStore:
                     user_id TEXT NOT NULL,
                     name TEXT NOT NULL,
                     description TEXT,
-                    embedding vector(1536),
+                    embedding halfvec(1536),
                     item_count INTEGER DEFAULT 0,
                     created_at TIMESTAMP DEFAULT NOW(),
                     UNIQUE(user_id, name)
                 )
             """)
 
-            # Create item_categories junction table
-            await conn.execute("""
+            # Create item_categories junction table. Nothing can reference the id of a
+            # partitioned items table (its keys include user_id), so in that layout the
+            # item deletes remove links themselves (see delete_items)
+            item_ref = "" if self._items_partitioned else " REFERENCES items(id) ON DELETE CASCADE"
+            await conn.execute(f"""
                 CREATE TABLE IF NOT EXISTS item_categories (
-                    item_id INTEGER REFERENCES items(id) ON DELETE CASCADE,
+                    item_id INTEGER{item_ref},
                     category_id INTEGER REFERENCES categories(id) ON DELETE CASCADE,
                     confidence FLOAT DEFAULT 1.0,
                     PRIMARY KEY (item_id, category_id)
@@ -149,19 +341,216 @@ class VectorStore:
                 ON categories(user_id)
             """)
 
-            # Create vector similarity indexes
+            # Match the ORDER BYs of list_items_for_compaction and get_user_memory, so
+            # both read the first rows of an index range instead of sorting all user items
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_items_user_compaction
+                ON items(user_id, importance ASC, accessed_at ASC NULLS FIRST)
+                INCLUDE (id)
+            """)
+
+            # content is not INCLUDEd: long texts would exceed the B-tree row size limit
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_items_user_recent
+                ON items(user_id, created_at DESC)
+                INCLUDE (id, item_type, importance)
+            """)
+
+            # The junction's primary key leads with item_id; lookups by category need their own
             await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_resources_embedding
-                ON resources USING ivfflat (embedding vector_cosine_ops)
+                CREATE INDEX IF NOT EXISTS idx_item_categories_category
+                ON item_categories(category_id)
             """)
 
+            # Tables created before the switch to halfvec still hold vector(1536)
+            await self._migrate_to_halfvec(conn)
+
+            # HNSW bookkeeping: parameters each table's indexes were built with
             await conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_items_embedding
-                ON items USING ivfflat (embedding vector_cosine_ops)
+                CREATE TABLE IF NOT EXISTS ann_config (
+                    table_name TEXT PRIMARY KEY,
+                    profile TEXT NOT NULL,
+                    m INTEGER NOT NULL,
+                    ef_construction INTEGER NOT NULL,
+                    row_count BIGINT NOT NULL,
+                    updated_at TIMESTAMP DEFAULT NOW()
+                )
             """)
 
+            # Create vector similarity indexes (HNSW over halfvec; replaces the old ivfflat ones)
+            await conn.execute("DROP INDEX IF EXISTS idx_resources_embedding")
+            await conn.execute("DROP INDEX IF EXISTS idx_items_embedding")
+
+            for table in ("resources", "items"):
+                await self._configure_ann(conn, table)
+
             logger.info("✓ Database schema initialized")
 
+    async def _create_user_table(self, conn: asyncpg.Connection, table: str, columns: str) -> bool:
+        """Create table (id SERIAL plus columns) if missing, hash-partitioned by user_id
+        when partitions is set. Returns whether the table is partitioned.
+
+        Postgres prunes to the user's partition, so semantic_search walks an HNSW graph
+        holding only that partition's vectors.
+        """
+        relkind = await conn.fetchval(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass($1)", table
+        )
+        if relkind is None and self.partitions:
+            await conn.execute(f"""
+                CREATE TABLE {table} (
+                    id SERIAL,
+                    {columns.strip()},
+                    PRIMARY KEY (id, user_id)
+                ) PARTITION BY HASH (user_id)
+            """)
+            for remainder in range(self.partitions):
+                await conn.execute(f"""
+                    CREATE TABLE {table}_p{remainder} PARTITION OF {table}
+                    FOR VALUES WITH (MODULUS {self.partitions}, REMAINDER {remainder})
+                """)
+            relkind = "p"
+            logger.info(f"Created {table} table with {self.partitions} hash partitions")
+        elif relkind is None:
+            await conn.execute(f"""
+                CREATE TABLE {table} (
+                    id SERIAL PRIMARY KEY,
+                    {columns.strip()}
+                )
+            """)
+        elif relkind != "p" and self.partitions:
+            logger.warning(
+                f"{table} table already exists unpartitioned; partitions is ignored for it. "
+                "To migrate: rename it, restart to create the partitioned table, copy the "
+                "rows across and recreate the tables that reference it"
+            )
+        return relkind == "p"
+
+    async def _configure_ann(self, conn: asyncpg.Connection, table: str):
+        """Build the HNSW indexes of a table with parameters sized to its row count
+
+        Two indexes per table: exact halfvec cosine, and binary-quantized Hamming for
+        the candidate stage of semantic_search (an expression index, so no shadow
+        column has to be kept in sync). They are rebuilt when the chosen profile
+        changes: on first run, when ann_profile changes, or when the table has grown
+        ANN_REBUILD_GROWTH times since the last build.
+        """
+        row_count = await conn.fetchval(f"SELECT COUNT(*) FROM {table}")
+        stored = await conn.fetchrow(
+            "SELECT profile, row_count FROM ann_config WHERE table_name = $1",
+            table
+        )
+        profile = self.ann_profile or _ann_profile_for_rows(row_count)
+
+        if stored is not None and stored['profile'] != profile and not self.ann_profile:
+            if row_count < ANN_REBUILD_GROWTH * max(stored['row_count'], 1):
+                # Not grown enough to be worth a rebuild yet
+                profile = stored['profile']
+
+        if stored is None or stored['profile'] != profile:
+            m, ef_construction = HNSW_BUILD_PARAMS[profile]
+            logger.info(
+                f"Building HNSW indexes on {table} ({row_count} rows): "
+                f"profile={profile}, m={m}, ef_construction={ef_construction}"
+            )
+            async with conn.transaction():
+                await conn.execute(f"SET LOCAL maintenance_work_mem = '{HNSW_MAINTENANCE_WORK_MEM}'")
+                await conn.execute(f"DROP INDEX IF EXISTS idx_{table}_embedding_hnsw")
+                await conn.execute(f"DROP INDEX IF EXISTS idx_{table}_embedding_bq")
+                await conn.execute(f"""
+                    CREATE INDEX idx_{table}_embedding_hnsw
+                    ON {table} USING hnsw (embedding halfvec_cosine_ops)
+                    WITH (m = {m}, ef_construction = {ef_construction})
+                """)
+                await conn.execute(f"""
+                    CREATE INDEX idx_{table}_embedding_bq
+                    ON {table} USING hnsw ((binary_quantize(embedding)::bit(1536)) bit_hamming_ops)
+                    WITH (m = {m}, ef_construction = {ef_construction})
+                """)
+                await conn.execute(
+                    """
+                    INSERT INTO ann_config (table_name, profile, m, ef_construction, row_count)
+                    VALUES ($1, $2, $3, $4, $5)
+                    ON CONFLICT (table_name) DO UPDATE
+                    SET profile = $2, m = $3, ef_construction = $4, row_count = $5,
+                        updated_at = NOW()
+                    """,
+                    table,
+                    profile,
+                    m,
+                    ef_construction,
+                    row_count
+                )
+
+        self._table_profiles[table] = profile
+
+    async def _migrate_to_halfvec(self, conn: asyncpg.Connection):
+        """Convert vector(1536) embedding columns to halfvec(1536) in place"""
+        for table in EMBEDDING_TABLES:
+            column_type = await conn.fetchval(
+                """
+                SELECT format_type(atttypid, atttypmod)
+                FROM pg_attribute
+                WHERE attrelid = $1::regclass AND attname = 'embedding'
+                """,
+                table
+            )
+            if column_type == "vector(1536)":
+                await conn.execute(f"DROP INDEX IF EXISTS idx_{table}_embedding")
+                await conn.execute(
+                    f"ALTER TABLE {table} ALTER COLUMN embedding TYPE {EMBEDDING_TYPE} "
+                    f"USING embedding::{EMBEDDING_TYPE}"
+                )
+                logger.info(f"Converted {table}.embedding to {EMBEDDING_TYPE}")
+
+    async def _prepared(self, conn: asyncpg.Connection, sql: str):
+        """Prepared statement for sql on this connection, prepared on first use.
+
+        Lazily rather than in _init_connection: the pool's first connections open
+        before _init_schema has created (or migrated) the tables.
+        """
+        statements = conn.prepared_statements
+        stmt = statements.get(sql)
+        if stmt is None:
+            stmt = statements[sql] = await conn.prepare(sql)
+        return stmt
+
+    def _search_cache_key(
+        self,
+        user_id: str,
+        query_embedding: List[float],
+        limit: int,
+        table: str,
+        profile: str
+    ) -> Tuple:
+        digest = hashlib.blake2b(array.array("f", query_embedding).tobytes(), digest_size=16).digest()
+        return (user_id, self._search_generations.get(user_id, 0), table, limit, profile, digest)
+
+    def _search_cache_get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        entry = self._search_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, results = entry
+        if time.monotonic() >= expires_at:
+            del self._search_cache[key]
+            return None
+        self._search_cache.move_to_end(key)
+        return list(results)
+
+    def _search_cache_put(self, key: Tuple, results: List[Dict[str, Any]]) -> None:
+        self._search_cache[key] = (time.monotonic() + self.search_cache_ttl, list(results))
+        self._search_cache.move_to_end(key)
+        while len(self._search_cache) > DEFAULT_SEARCH_CACHE_MAX_ENTRIES:
+            self._search_cache.popitem(last=False)
+
+    def invalidate_search_cache(self, user_id: Optional[str] = None) -> None:
+        """Forget cached semantic_search results for one user, or for everyone"""
+        if user_id is None:
+            self._search_cache.clear()
+            self._search_generations.clear()
+        else:
+            self._search_generations[user_id] = self._search_generations.get(user_id, 0) + 1
+
     async def add_resource(
         self,
         user_id: str,
@@ -183,19 +572,16 @@ class VectorStore:
             Resource ID
         """
         async with self.pool.acquire() as conn:
-            result = await conn.fetchrow(
-                """
-                INSERT INTO resources (user_id, resource_type, content, embedding, metadata)
-                VALUES ($1, $2, $3, $4, $5)
-                RETURNING id
-                """,
+            stmt = await self._prepared(conn, _ADD_RESOURCE_SQL)
+            result = await stmt.fetchrow(
                 user_id,
                 resource_type,
                 content,
-                np.array(embedding),
+                embedding,
                 metadata or {}
             )
-            return result['id']
+        self.invalidate_search_cache(user_id)
+        return result['id']
 
     async def add_item(
         self,
@@ -222,67 +608,173 @@ class VectorStore:
             Item ID
         """
         async with self.pool.acquire() as conn:
-            result = await conn.fetchrow(
-                """
-                INSERT INTO items (user_id, resource_id, item_type, content,
-                                 importance, embedding, metadata)
-                VALUES ($1, $2, $3, $4, $5, $6, $7)
-                RETURNING id
-                """,
+            stmt = await self._prepared(conn, _ADD_ITEM_SQL)
+            result = await stmt.fetchrow(
                 user_id,
                 resource_id,
                 item_type,
                 content,
                 importance,
-                np.array(embedding),
+                embedding,
                 metadata or {}
             )
-            return result['id']
+        self.invalidate_search_cache(user_id)
+        return result['id']
+
+    async def add_resources(
+        self,
+        user_id: str,
+        resources: List[Dict[str, Any]]
+    ) -> List[int]:
+        """Add several resources with one INSERT ... SELECT FROM unnest(...)
+
+        Args:
+            user_id: User identifier
+            resources: Dicts with 'resource_type', 'content', 'embedding' and
+                optional 'metadata'
+
+        Returns:
+            Resource IDs, in input order
+        """
+        if not resources:
+            return []
+        async with self.pool.acquire() as conn:
+            ids = await self._insert_many(conn, _INSERT_RESOURCES_SQL, [
+                (user_id, r['resource_type'], r['content'], r['embedding'], r.get('metadata') or {})
+                for r in resources
+            ])
+        self.invalidate_search_cache(user_id)
+        return ids
+
+    async def _insert_many(self, conn: asyncpg.Connection, sql: str, rows: List[Tuple]) -> List[int]:
+        """Run an unnest INSERT (_INSERT_*_SQL) for row tuples; returns the new ids"""
+        if not rows:
+            return []
+        records = await conn.fetch(sql, *(list(column) for column in zip(*rows)))
+        return [record['id'] for record in records]
+
+    @contextlib.asynccontextmanager
+    async def batch(self) -> AsyncIterator[VectorBatch]:
+        """Queue add_resource/add_item calls and insert them on one connection in one
+        transaction (one statement per table) when the block exits without error.
+
+        Usage:
+            async with store.batch() as batch:
+                for fact in facts:
+                    batch.add_item(user_id, "fact", fact, embedding)
+            ids = batch.item_ids
+        """
+        queued = VectorBatch()
+        yield queued
+        if not queued.resources and not queued.items:
+            return
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                queued.resource_ids = await self._insert_many(conn, _INSERT_RESOURCES_SQL, queued.resources)
+                queued.item_ids = await self._insert_many(conn, _INSERT_ITEMS_SQL, queued.items)
+        for user_id in {row[0] for row in queued.resources} | {row[0] for row in queued.items}:
+            self.invalidate_search_cache(user_id)
+
+    async def add_items(
+        self,
+        user_id: str,
+        items: List[Dict[str, Any]]
+    ) -> None:
+        """Add several items with one binary COPY on one connection
+
+        Args:
+            user_id: User identifier
+            items: Dicts with 'item_type', 'content', 'embedding' and optional
+                'resource_id', 'importance', 'metadata'
+        """
+        if not items:
+            return
+        async with self.pool.acquire() as conn:
+            # Embeddings go through the pgvector codec registered in _init_connection
+            await conn.copy_records_to_table(
+                'items',
+                records=[
+                    (
+                        user_id,
+                        item.get('resource_id'),
+                        item['item_type'],
+                        item['content'],
+                        item.get('importance', 0.5),
+                        item['embedding'],
+                        item.get('metadata') or {}
+                    )
+                    for item in items
+                ],
+                columns=('user_id', 'resource_id', 'item_type', 'content',
+                         'importance', 'embedding', 'metadata')
+            )
+        self.invalidate_search_cache(user_id)
 
     async def semantic_search(
         self,
         user_id: str,
         query_embedding: List[float],
         limit: int = 10,
-        search_type: str = "items"
+        search_type: str = "items",
+        search_profile: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Semantic search using vector similarity
 
+        Two stages: overfetch candidates by Hamming distance on the binary-quantized
+        index, then rerank them by exact cosine distance.
+
         Args:
             user_id: User identifier
             query_embedding: Query vector
             limit: Maximum results
             search_type: 'items' or 'resources'
+            search_profile: 'fast', 'balanced' or 'recall_max' (see SEARCH_PROFILES);
+                defaults to ann_profile, else the profile the table's index was built with
 
         Returns:
             List of matching results with similarity scores
         """
         table = "items" if search_type == "items" else "resources"
+        profile = search_profile or self.ann_profile or self._table_profiles.get(table, "balanced")
+        overfetch, ef_search = SEARCH_PROFILES.get(profile, SEARCH_PROFILES["balanced"])
+        candidates = limit * overfetch
+
+        cache_key = None
+        if self.search_cache_ttl > 0:
+            cache_key = self._search_cache_key(user_id, query_embedding, limit, table, profile)
+            cached = self._search_cache_get(cache_key)
+            if cached is not None:
+                return cached
 
         async with self.pool.acquire() as conn:
-            results = await conn.fetch(
-                f"""
-                SELECT id, content, metadata,
-                       1 - (embedding <=> $1) as similarity
-                FROM {table}
-                WHERE user_id = $2
-                ORDER BY embedding <=> $1
-                LIMIT $3
-                """,
-                np.array(query_embedding),
-                user_id,
-                limit
-            )
+            async with conn.transaction():
+                # The index scan returns at most ef_search rows
+                settings = f"SET LOCAL hnsw.ef_search = {min(max(ef_search, candidates), HNSW_MAX_EF_SEARCH)}"
+                if self._iterative_scan:
+                    # Keep scanning the graph until the user_id filter has yielded enough
+                    # candidates, instead of returning short when other users' rows fill ef_search
+                    settings += "; SET LOCAL hnsw.iterative_scan = strict_order"
+                await conn.execute(settings)
+                stmt = await self._prepared(conn, _SEARCH_SQL[table])
+                results = await stmt.fetch(
+                    query_embedding,
+                    user_id,
+                    limit,
+                    candidates
+                )
 
-            return [
-                {
-                    "id": row['id'],
-                    "content": row['content'],
-                    "metadata": row['metadata'],
-                    "similarity": float(row['similarity'])
-                }
-                for row in results
-            ]
+        found = [
+            {
+                "id": row['id'],
+                "content": row['content'],
+                "metadata": row['metadata'],
+                "similarity": float(row['similarity'])
+            }
+            for row in results
+        ]
+        if cache_key is not None:
+            self._search_cache_put(cache_key, found)
+        return found
 
     async def get_user_memory(
         self,
@@ -299,19 +791,13 @@ class VectorStore:
             Memory summary
         """
         async with self.pool.acquire() as conn:
-            # Get total counts
-            resource_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM resources WHERE user_id = $1",
-                user_id
-            )
-
-            item_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM items WHERE user_id = $1",
-                user_id
-            )
-
-            category_count = await conn.fetchval(
-                "SELECT COUNT(*) FROM categories WHERE user_id = $1",
+            # All three counts in one round-trip
+            counts = await conn.fetchrow(
+                """
+                SELECT (SELECT COUNT(*) FROM resources WHERE user_id = $1) AS resources,
+                       (SELECT COUNT(*) FROM items WHERE user_id = $1) AS items,
+                       (SELECT COUNT(*) FROM categories WHERE user_id = $1) AS categories
+                """,
                 user_id
             )
 
@@ -329,9 +815,9 @@ class VectorStore:
             )
 
             return {
-                "total_resources": resource_count,
-                "total_items": item_count,
-                "total_categories": category_count,
+                "total_resources": counts['resources'],
+                "total_items": counts['items'],
+                "total_categories": counts['categories'],
                 "recent_items": [
                     {
                         "id": row['id'],
@@ -367,13 +853,13 @@ class VectorStore:
                 result = await conn.fetchrow(
                     """
                     INSERT INTO categories (user_id, name, description, embedding)
-                    VALUES ($1, $2, $3, $4)
+                    VALUES ($1, $2, $3, $4::halfvec)
                     RETURNING id
                     """,
                     user_id,
                     name,
                     description,
-                    np.array(embedding)
+                    embedding
                 )
                 return result['id']
             except asyncpg.UniqueViolationError:
@@ -402,33 +888,29 @@ class VectorStore:
             confidence: Confidence score (0-1)
         """
         async with self.pool.acquire() as conn:
+            # One statement: upsert the link and bump item_count only when the link is
+            # new (xmax = 0 on the returned row means it was inserted, not updated)
             await conn.execute(
                 """
-                INSERT INTO item_categories (item_id, category_id, confidence)
-                VALUES ($1, $2, $3)
-                ON CONFLICT (item_id, category_id)
-                DO UPDATE SET confidence = $3
+                WITH ins AS (
+                    INSERT INTO item_categories (item_id, category_id, confidence)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (item_id, category_id)
+                    DO UPDATE SET confidence = EXCLUDED.confidence
+                    RETURNING (xmax = 0) AS inserted
+                )
+                UPDATE categories
+                SET item_count = item_count + 1
+                FROM ins
+                WHERE categories.id = $2 AND ins.inserted
                 """,
                 item_id,
                 category_id,
                 confidence
             )
 
-            # Update category item count
-            await conn.execute(
-                """
-                UPDATE categories
-                SET item_count = (
-                    SELECT COUNT(*) FROM item_categories
-                    WHERE category_id = $1
-                )
-                WHERE id = $1
-                """,
-                category_id
-            )
-
     async def delete_item(self, item_id: int) -> bool:
-        """Delete an item by ID (cascades to item_categories).
+        """Delete an item by ID (and its category links).
 
         Args:
             item_id: Item ID to delete
@@ -436,12 +918,43 @@ class VectorStore:
         Returns:
             True if deleted
         """
-        async with self.pool.acquire() as conn:
-            result = await conn.execute(
-                "DELETE FROM items WHERE id = $1",
-                item_id
+        return await self.delete_items([item_id]) > 0
+
+    async def delete_items(self, item_ids: List[int]) -> int:
+        """Delete many items (and their category links) in one statement.
+
+        Args:
+            item_ids: Item IDs to delete
+
+        Returns:
+            Number of items deleted
+        """
+        if not item_ids:
+            return 0
+        # Unlink in the same statement, whatever the layout: a partitioned items table
+        # has no FK cascade, and the removed links drive the item_count decrements
+        # (link_item_to_category only ever increments)
+        sql = """
+            WITH deleted AS (
+                DELETE FROM items WHERE id = ANY($1::int[]) RETURNING id, user_id
+            ), unlinked AS (
+                DELETE FROM item_categories WHERE item_id IN (SELECT id FROM deleted)
+                RETURNING category_id
+            ), recounted AS (
+                UPDATE categories
+                SET item_count = GREATEST(categories.item_count - u.n, 0)
+                FROM (
+                    SELECT category_id, COUNT(*) AS n FROM unlinked GROUP BY category_id
+                ) u
+                WHERE categories.id = u.category_id
             )
-            return result == "DELETE 1"
+            SELECT user_id FROM deleted
+        """
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(sql, list(item_ids))
+        for user_id in {row['user_id'] for row in rows}:
+            self.invalidate_search_cache(user_id)
+        return len(rows)
 
     async def list_items_for_compaction(
         self,
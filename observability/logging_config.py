@@ -3,9 +3,21 @@
 import json
 import logging
 import sys
-from datetime import datetime, timezone
+import time
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize a log record dict (orjson when installed; non-JSON values become str)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=str)
+
 
 class JsonFormatter(logging.Formatter):
     """Format log records as JSON lines."""
@@ -13,22 +25,36 @@ class JsonFormatter(logging.Formatter):
     def __init__(self, include_extra: bool = True):
         super().__init__()
         self.include_extra = include_extra
+        # UTC "YYYY-MM-DDTHH:MM:SS" of the last second seen; records arrive in bursts
+        self._ts_second = -1
+        self._ts_prefix = ""
+
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        """ISO-8601 UTC time the record was created, millisecond precision."""
+        second = int(record.created)
+        if second != self._ts_second:
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._ts_second = second
+        return f"{self._ts_prefix}.{int(record.msecs):03d}Z"
 
     def format(self, record: logging.LogRecord) -> str:
         log_obj: dict[str, Any] = {
-            "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            "timestamp": self._timestamp(record),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
-        if record.exc_info:
-            log_obj["exception"] = self.formatException(record.exc_info)
+        exc_info = record.exc_info
+        if exc_info:
+            log_obj["exception"] = self.formatException(exc_info)
         if record.pathname:
             log_obj["module"] = record.module
             log_obj["lineno"] = record.lineno
-        if self.include_extra and hasattr(record, "extra") and record.extra:
-            log_obj["extra"] = record.extra
-        return json.dumps(log_obj, default=str)
+        if self.include_extra:
+            extra = getattr(record, "extra", None)
+            if extra:
+                log_obj["extra"] = extra
+        return _json_dumps(log_obj)
 
 
 def setup_logging(
@@ -1,28 +1,72 @@
 """Simple in-memory metrics for latency, token counts, error rates."""
 
-import time
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional
 
 
-@dataclass
-class MetricPoint:
-    """Single metric value with timestamp."""
-    value: float
-    timestamp: float = field(default_factory=time.time)
+class LatencyHistogram:
+    """Log-bucketed latency histogram (HDR-style): O(1) record, fixed memory.
+
+    Bucket bounds grow by a factor of (1 + precision) from min_value to max_value,
+    so any percentile is reported within that relative error of the true value.
+    """
+
+    def __init__(self, min_value: float = 1e-6, max_value: float = 60.0, precision: float = 0.01):
+        self.min_value = min_value
+        self._log_growth = math.log1p(precision)
+        self._counts: List[int] = [0] * (int(math.log(max_value / min_value) / self._log_growth) + 2)
+        self._top = -1  # highest non-empty bucket
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        if value > self.min_value:
+            i = min(len(self._counts) - 1, int(math.log(value / self.min_value) / self._log_growth) + 1)
+        else:
+            i = 0
+        self._counts[i] += 1
+        if i > self._top:
+            self._top = i
+        self.count += 1
+        self.total += value
+
+    def value_at_percentile(self, percentile: float) -> float:
+        """Upper bound of the bucket holding the value at sorted index int(count * p/100)."""
+        if not self.count:
+            return 0.0
+        # Values above that index; p99 sits near the top, so walk down from there
+        above = self.count - 1 - min(self.count - 1, int(self.count * percentile / 100))
+        seen = 0
+        for i in range(self._top, -1, -1):
+            seen += self._counts[i]
+            if seen > above:
+                return self.min_value * math.exp(i * self._log_growth)
+        return self.min_value
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self._top = -1
+        self.count = 0
+        self.total = 0.0
 
 
 class MetricsCollector:
     """Collector for LLM and agent metrics."""
 
     def __init__(self):
-        self._llm_latencies: List[float] = []
-        self._llm_tokens_in: List[int] = []
-        self._llm_tokens_out: List[int] = []
+        self._max_samples = 1000
+        # Latency mean/p99 over every successful call since start (or reset)
+        self._llm_latency = LatencyHistogram()
+        # Bounded: appends past maxlen evict the oldest sample in O(1)
+        self._llm_tokens_in: Deque[int] = deque(maxlen=self._max_samples)
+        self._llm_tokens_out: Deque[int] = deque(maxlen=self._max_samples)
+        # Running totals over the token buffers, so get_stats does no scans
+        self._tokens_in_total = 0
+        self._tokens_out_total = 0
         self._llm_errors: int = 0
         self._llm_calls: int = 0
         self._agent_requests: int = 0
-        self._max_samples = 1000
 
     def record_llm_call(
         self,
@@ -34,30 +78,31 @@ class MetricsCollector:
         self._llm_calls += 1
         if error:
             self._llm_errors += 1
-        else:
-            self._llm_latencies.append(latency_sec)
-            self._llm_tokens_in.append(tokens_in)
-            self._llm_tokens_out.append(tokens_out)
-            if len(self._llm_latencies) > self._max_samples:
-                self._llm_latencies.pop(0)
-                self._llm_tokens_in.pop(0)
-                self._llm_tokens_out.pop(0)
+            return
+        self._llm_latency.record(latency_sec)
+        if len(self._llm_tokens_in) == self._max_samples:
+            self._tokens_in_total -= self._llm_tokens_in[0]
+            self._tokens_out_total -= self._llm_tokens_out[0]
+        self._llm_tokens_in.append(tokens_in)
+        self._llm_tokens_out.append(tokens_out)
+        self._tokens_in_total += tokens_in
+        self._tokens_out_total += tokens_out
 
     def record_agent_request(self) -> None:
         self._agent_requests += 1
 
     def get_stats(self) -> Dict:
         """Return current metrics snapshot."""
-        latencies = self._llm_latencies[-100:] if self._llm_latencies else []
+        latency = self._llm_latency
         return {
             "llm": {
                 "calls": self._llm_calls,
                 "errors": self._llm_errors,
                 "error_rate": self._llm_errors / self._llm_calls if self._llm_calls else 0,
-                "latency_mean_sec": sum(latencies) / len(latencies) if latencies else 0,
-                "latency_p99_sec": sorted(latencies)[int(len(latencies) * 0.99)] if len(latencies) > 10 else 0,
-                "tokens_in_total": sum(self._llm_tokens_in),
-                "tokens_out_total": sum(self._llm_tokens_out),
+                "latency_mean_sec": latency.total / latency.count if latency.count else 0,
+                "latency_p99_sec": latency.value_at_percentile(99) if latency.count > 10 else 0,
+                "tokens_in_total": self._tokens_in_total,
+                "tokens_out_total": self._tokens_out_total,
             },
             "agent": {
                 "requests": self._agent_requests,
@@ -65,9 +110,11 @@ class MetricsCollector:
         }
 
     def reset(self) -> None:
-        self._llm_latencies.clear()
+        self._llm_latency.reset()
         self._llm_tokens_in.clear()
         self._llm_tokens_out.clear()
+        self._tokens_in_total = 0
+        self._tokens_out_total = 0
         self._llm_errors = 0
         self._llm_calls = 0
         self._agent_requests = 0
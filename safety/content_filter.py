@@ -1,5 +1,6 @@
 """Content filtering for harmful output."""
 
+import functools
 import re
 from typing import Optional, Tuple
 
@@ -14,14 +15,28 @@ _HARMFUL_PATTERNS = (
 )
 
 
+@functools.lru_cache(maxsize=32)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Tuple["re.Pattern[str]", Tuple["re.Pattern[str]", ...]]:
+    """(one case-insensitive alternation of all patterns, each pattern on its own).
+    The alternation answers "any match?" in one scan; the individual patterns find
+    every blocked span when matches from different patterns overlap."""
+    combined = re.compile("|".join(f"(?:{p})" for p in patterns), re.I)
+    return combined, tuple(re.compile(p, re.I) for p in patterns)
+
+
+# Default blocklist, compiled at import
+_COMBINED = _compile_patterns(_HARMFUL_PATTERNS)
+
+
 class ContentFilter:
     """Filter harmful content from LLM output."""
 
     def __init__(self, custom_patterns: Optional[list[str]] = None):
-        patterns = list(_HARMFUL_PATTERNS)
         if custom_patterns:
-            patterns.extend(custom_patterns)
-        self._compiled = [re.compile(p, re.I) for p in patterns]
+            # Cached per blocklist: filters are rebuilt for every agent iteration
+            self._combined, self._compiled = _compile_patterns(_HARMFUL_PATTERNS + tuple(custom_patterns))
+        else:
+            self._combined, self._compiled = _COMBINED
 
     def filter(self, text: str) -> Tuple[str, bool]:
         """
@@ -31,18 +46,29 @@ class ContentFilter:
         """
         if not text:
             return text, False
-        filtered = text
-        was_filtered = False
-        for pat in self._compiled:
-            for m in pat.finditer(filtered):
-                was_filtered = True
-                filtered = filtered[: m.start()] + "[content blocked]" + filtered[m.end() :]
-        return filtered, was_filtered
+        if self._combined.search(text) is None:
+            return text, False
+        # Spans from every pattern (all against the original text), overlaps merged
+        spans = sorted((m.start(), m.end()) for pat in self._compiled for m in pat.finditer(text))
+        parts = []
+        prev = 0
+        start, end = spans[0]
+        for s, e in spans[1:]:
+            if s <= end:
+                end = max(end, e)
+                continue
+            parts.append(text[prev:start])
+            parts.append("[content blocked]")
+            prev = end
+            start, end = s, e
+        parts.append(text[prev:start])
+        parts.append("[content blocked]")
+        parts.append(text[end:])
+        return "".join(parts), True
 
     def is_safe(self, text: str) -> bool:
         """Return True if no harmful content detected."""
-        _, blocked = self.filter(text)
-        return not blocked
+        return not text or self._combined.search(text) is None
 
 
 def filter_harmful_content(
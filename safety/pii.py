@@ -23,15 +23,25 @@ _PII_PATTERNS = [
 ]
 
 
-def redact_pii(text: str, replacement: str = PII_REDACTED) -> str:
+# Applied one after another, in list order: a replacement can create the word boundary
+# a later pattern needs (e.g. "a@b.comx555-123-4567"), so one combined alternation
+# would not redact the same text
+_PII_COMPILED = [(re.compile(pattern), f"[{kind.upper()}]") for pattern, kind in _PII_PATTERNS]
+
+# Any pattern at all; most log lines have no PII and skip the per-pattern passes
+_PII_ANY_RE = re.compile("|".join(f"(?:{pattern})" for pattern, _ in _PII_PATTERNS))
+
+
+def redact_pii(text: str, replacement: str = PII_REDACTED, labelled: bool = False) -> str:
     """
     Redact PII from text. Returns text with matches replaced.
+    With labelled=True each match is replaced by its kind instead, e.g. [EMAIL], [SSN].
     """
-    if not text:
+    if not text or not _PII_ANY_RE.search(text):
         return text
     result = text
-    for pattern, _ in _PII_PATTERNS:
-        result = re.sub(pattern, replacement, result)
+    for regex, label in _PII_COMPILED:
+        result = regex.sub(label if labelled else replacement, result)
     return result
 
 
@@ -1,29 +1,70 @@
 """Security utilities for GrizzyClaw"""
 
+import asyncio
 import base64
 import hashlib
 import hmac
+import os
 import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+import jwt
 from cryptography.fernet import Fernet
-from jose import jwt, JWTError
 
 try:
     import bcrypt
 except ImportError:
     bcrypt = None  # type: ignore[assignment]
 
-# Fallback when bcrypt not available (e.g. passlib only)
-from passlib.context import CryptContext
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt work factor (log2 rounds); each +1 doubles hash/verify time
+DEFAULT_BCRYPT_COST = 12
+# Async hash/verify calls allowed queued or running at once; more fail fast
+DEFAULT_MAX_INFLIGHT_HASHES = 64
+# Verified JWT payloads are reused for this long (never past the token's exp)
+DEFAULT_JWT_CACHE_TTL = 5.0
+JWT_CACHE_MAX_ENTRIES = 10000
+
+# Shared by all SecurityManagers; bcrypt releases the GIL, so these threads hash in
+# parallel (and, unlike worker processes, work in the frozen macOS app)
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt"
+            )
+        return _hash_executor
+
+
+class PasswordHashingOverloaded(RuntimeError):
+    """Raised when too many async password hashes/verifies are already in flight."""
 
 
 class SecurityManager:
     """Handles encryption, authentication, and security utilities"""
 
-    def __init__(self, secret_key: str):
+    def __init__(
+        self,
+        secret_key: str,
+        bcrypt_cost: int = DEFAULT_BCRYPT_COST,
+        max_inflight_hashes: int = DEFAULT_MAX_INFLIGHT_HASHES,
+        jwt_cache_ttl: float = DEFAULT_JWT_CACHE_TTL,
+    ):
         self.secret_key = secret_key
+        self.bcrypt_cost = bcrypt_cost
+        self._hash_slots = threading.BoundedSemaphore(max(1, max_inflight_hashes))
+        self.jwt_cache_ttl = jwt_cache_ttl
+        # sha256(token) -> (expires_at wall-clock time, payload); only successes are cached
+        self._jwt_cache: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+        self._jwt_cache_lock = threading.Lock()
         self._fernet = Fernet(self._derive_key(secret_key))
 
     def _derive_key(self, secret: str) -> bytes:
@@ -45,20 +86,37 @@ class SecurityManager:
 
     def hash_password(self, password: str) -> str:
         """Hash a password. Bcrypt limits input to 72 bytes; longer passwords are truncated."""
+        if bcrypt is None:
+            raise RuntimeError("bcrypt package required: pip install bcrypt")
         pwd_bytes = self._password_bytes_72(password)
-        if bcrypt is not None:
-            return bcrypt.hashpw(pwd_bytes, bcrypt.gensalt()).decode("ascii")
-        return pwd_context.hash(pwd_bytes.decode("utf-8", errors="replace"))
+        return bcrypt.hashpw(pwd_bytes, bcrypt.gensalt(rounds=self.bcrypt_cost)).decode("ascii")
 
     def verify_password(self, password: str, hashed: str) -> bool:
         """Verify a password against its hash. Uses same 72-byte truncation as hash_password."""
+        if bcrypt is None:
+            raise RuntimeError("bcrypt package required: pip install bcrypt")
         pwd_bytes = self._password_bytes_72(password)
-        if bcrypt is not None:
-            try:
-                return bcrypt.checkpw(pwd_bytes, hashed.encode("ascii"))
-            except Exception:
-                return False
-        return pwd_context.verify(pwd_bytes.decode("utf-8", errors="replace"), hashed)
+        try:
+            return bcrypt.checkpw(pwd_bytes, hashed.encode("ascii"))
+        except Exception:
+            return False
+
+    async def _run_hash_job(self, fn, *args):
+        """Run a bcrypt call on the shared hash threads, keeping the event loop free."""
+        if not self._hash_slots.acquire(blocking=False):
+            raise PasswordHashingOverloaded("Too many password hash requests in flight")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_get_hash_executor(), fn, *args)
+        finally:
+            self._hash_slots.release()
+
+    async def hash_password_async(self, password: str) -> str:
+        """hash_password off the event loop. Raises PasswordHashingOverloaded when saturated."""
+        return await self._run_hash_job(self.hash_password, password)
+
+    async def verify_password_async(self, password: str, hashed: str) -> bool:
+        """verify_password off the event loop. Raises PasswordHashingOverloaded when saturated."""
+        return await self._run_hash_job(self.verify_password, password, hashed)
 
     def create_jwt_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
@@ -75,12 +133,32 @@ class SecurityManager:
         return jwt.encode(to_encode, self.secret_key, algorithm="HS256")
 
     def verify_jwt_token(self, token: str) -> Optional[dict]:
-        """Verify and decode JWT token"""
+        """Verify and decode JWT token (recently verified tokens are served from cache)"""
+        key = hashlib.sha256(token.encode()).digest() if self.jwt_cache_ttl > 0 else None
+        now = time.time()
+        if key is not None:
+            with self._jwt_cache_lock:
+                entry = self._jwt_cache.get(key)
+                if entry is not None:
+                    if entry[0] > now:
+                        self._jwt_cache.move_to_end(key)
+                        return dict(entry[1])
+                    del self._jwt_cache[key]
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=["HS256"])
-            return payload
-        except JWTError:
+        except jwt.PyJWTError:
             return None
+        if key is not None:
+            expires_at = now + self.jwt_cache_ttl
+            exp = payload.get("exp")
+            if isinstance(exp, (int, float)):
+                expires_at = min(expires_at, float(exp))
+            with self._jwt_cache_lock:
+                self._jwt_cache[key] = (expires_at, dict(payload))
+                self._jwt_cache.move_to_end(key)
+                while len(self._jwt_cache) > JWT_CACHE_MAX_ENTRIES:
+                    self._jwt_cache.popitem(last=False)
+        return payload
 
     def generate_api_key(self) -> str:
         """Generate a secure API key"""
@@ -94,7 +172,9 @@ class SecurityManager:
         self, payload: bytes, signature: str, secret: str
     ) -> bool:
         """Verify webhook signature (HMAC-SHA256)"""
-        expected = hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+        # hmac.digest with a digest name is a single call into OpenSSL's HMAC, which
+        # picks SHA-NI / ARMv8 SHA instructions at runtime
+        expected = hmac.digest(secret.encode(), payload, "sha256").hex()
         return hmac.compare_digest(signature, expected)
 
 
@@ -0,0 +1,31 @@
+"""Tests for PII redaction."""
+
+import random
+import re
+
+from grizzyclaw.safety.pii import _PII_PATTERNS, redact_pii
+
+
+def _redact_sequentially(text: str, replacement: str = "[REDACTED]") -> str:
+    for pattern, _ in _PII_PATTERNS:
+        text = re.sub(pattern, replacement, text)
+    return text
+
+
+def test_adjacent_matches_are_all_redacted():
+    # The email's replacement supplies the word boundary the phone pattern needs
+    assert redact_pii("a@b.comx555-123-4567") == "[REDACTED][REDACTED]"
+    assert redact_pii("a@b.comx555-123-4567", labelled=True) == "[EMAIL][PHONE]"
+
+
+def test_text_without_pii_is_unchanged():
+    assert redact_pii("nothing to see here") == "nothing to see here"
+    assert redact_pii("") == ""
+
+
+def test_matches_sequential_per_pattern_redaction():
+    rnd = random.Random(0)
+    alphabet = "ab@.-x _()0123456789sk"
+    for _ in range(5000):
+        text = "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 40)))
+        assert redact_pii(text) == _redact_sequentially(text), text
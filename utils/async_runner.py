@@ -7,6 +7,37 @@ from typing import Any, Coroutine, TypeVar
 T = TypeVar("T")
 
 
+async def aclose_loop_connections() -> None:
+    """Close connections pooled on the running loop: the LLM providers' shared HTTP
+    connector and MCP sessions (stdio server processes) and clients. Call before a
+    short-lived loop is closed, or its sockets and subprocesses are leaked. Never raises."""
+    try:
+        from grizzyclaw.llm._pool import close_connector
+        await close_connector()
+    except Exception:
+        pass
+    try:
+        from grizzyclaw.mcp_client import aclose_mcp_connections
+        await aclose_mcp_connections()
+    except Exception:
+        pass
+
+
+def close_loop_connections(loop: asyncio.AbstractEventLoop) -> None:
+    """Run aclose_loop_connections() on loop (not running) before loop.close()."""
+    try:
+        loop.run_until_complete(aclose_loop_connections())
+    except Exception:
+        pass
+
+
+async def _run_and_close(coro: Coroutine[Any, Any, T]) -> T:
+    try:
+        return await coro
+    finally:
+        await aclose_loop_connections()
+
+
 def run_async(coro: Coroutine[Any, Any, T]) -> T:
     """Run an async coroutine from a sync context (e.g. GUI button handler).
 
@@ -22,7 +53,7 @@ def run_async(coro: Coroutine[Any, Any, T]) -> T:
 
     def task():
         try:
-            result[0] = asyncio.run(coro)
+            result[0] = asyncio.run(_run_and_close(coro))
         except Exception as e:
             exception[0] = e
 
@@ -37,9 +68,9 @@ def run_async(coro: Coroutine[Any, Any, T]) -> T:
                 app.processEvents()
             thread.join(timeout=0.1)
         else:
-            result[0] = asyncio.run(coro)
+            result[0] = asyncio.run(_run_and_close(coro))
     except ImportError:
-        result[0] = asyncio.run(coro)
+        result[0] = asyncio.run(_run_and_close(coro))
     except Exception:
         thread = threading.Thread(target=task, daemon=True)
         thread.start()